@@ -22,6 +22,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # local
     "users",
     "events",
@@ -52,8 +53,15 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "utils.db.routers.ReplicaPinMiddleware",
 ]
 
+# Log the query shapes a request repeats this many times (N+1 patterns).
+REPEATED_QUERY_THRESHOLD = int(os.getenv("REPEATED_QUERY_THRESHOLD", 5))
+if DEBUG:
+    # Outermost, so the queries of every other middleware are counted too.
+    MIDDLEWARE.insert(0, "utils.db.debug.RepeatedQueryMiddleware")
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -86,6 +94,43 @@ DATABASES = {
     }
 }
 
+# Streaming replicas of "default" serving the list and detail reads
+# (utils.db.routers); each is a mirror of "default" in tests.
+REPLICA_DATABASES = []
+replica_hosts = os.getenv("POSTGRES_REPLICA_HOSTS", "")
+for number, host in enumerate(filter(None, replica_hosts.split(","))):
+    alias = f"replica_{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ["utils.db.routers.ReplicaRouter"]
+# Seconds a user's reads stay on "default" after their own write,
+# covering the replication lag.
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 5))
+
+REDIS_HOST = os.getenv("REDIS_HOST")
+if REDIS_HOST:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://:{}@{}:{}/0".format(
+                os.getenv("REDIS_PASSWORD", ""),
+                REDIS_HOST,
+                os.getenv("REDIS_PORT", 6379),
+            ),
+        }
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+# Seconds an anonymous listing response is served from the cache
+API_CACHE_TIMEOUT = int(os.getenv("API_CACHE_TIMEOUT", 60))
+
 AUTH_USER_MODEL = "users.CustomUser"
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -108,6 +153,13 @@ TIME_ZONE = "UTC"
 USE_I18N = True
 USE_TZ = True
 
+# Local time zone used to resolve calendar filters ("today", "this weekend")
+EVENTS_TIME_ZONE = os.getenv("EVENTS_TIME_ZONE", "Asia/Bishkek")
+# How far ahead occurrences of regular events are materialized
+EVENTS_OCCURRENCE_HORIZON_WEEKS = int(os.getenv("EVENTS_OCCURRENCE_HORIZON_WEEKS", 8))
+# Followers above which an organization's events are not copied to timelines
+TIMELINE_FANOUT_MAX_FOLLOWERS = int(os.getenv("TIMELINE_FANOUT_MAX_FOLLOWERS", 10000))
+
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 
@@ -125,7 +177,7 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "utils.pagination.CappedLimitOffsetPagination",
     "PAGE_SIZE": 100,
 }
 
@@ -149,6 +201,11 @@ EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS")
 EMAIL_PORT = os.getenv("EMAIL_PORT")
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
+# Seconds a send may block on the mail server before it is given up
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 30))
+# Outbox delivery (users.mail): attempts before giving up, first retry delay
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv("EMAIL_OUTBOX_RETRY_DELAY", 60))
 
 
 MEDIA_ROOT = os.path.join(BASE_DIR, "media/")
@@ -163,6 +220,14 @@ if not DEBUG:
     AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY")
     AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 
+# Direct uploads: presigned S3 posts in production, a local stand-in otherwise
+UPLOADS_BACKEND = os.getenv(
+    "UPLOADS_BACKEND",
+    "utils.uploads.LocalUploadBackend" if DEBUG else "utils.uploads.S3UploadBackend",
+)
+UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE", 10 * 1024 * 1024))
+UPLOAD_URL_EXPIRES = int(os.getenv("UPLOAD_URL_EXPIRES", 15 * 60))
+
 LOGIN_REDIRECT_URL = "/"
 
 MATERIAL_ADMIN_SITE = {
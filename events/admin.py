@@ -22,6 +22,7 @@ class OccurrenceDaysAdmin(admin.ModelAdmin):
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
     icon_name = "event"
+    list_filter = ("moderation_status",)
     # list_display = ("user", "username", "first_name", "last_name", "following_count")
 
 
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.models import EventImage
+from users.models import Customer, Organization
+from utils.cache import EVENTS, ORGANIZATIONS
+from utils.images import process_pending
+
+# Model, image field and the cache namespaces serving its variants.
+IMAGE_FIELDS = (
+    (EventImage, "image", (EVENTS,)),
+    (Customer, "avatar", ()),
+    (Organization, "avatar", (ORGANIZATIONS,)),
+)
+
+
+class Command(BaseCommand):
+    help = "Generate resized, metadata-free variants of uploaded images"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep polling for new uploads every INTERVAL seconds",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            for model, field, namespaces in IMAGE_FIELDS:
+                processed = process_pending(
+                    model, field, options["batch_size"], namespaces
+                )
+                if processed:
+                    self.stdout.write(
+                        f"Processed {processed} {model._meta.verbose_name} images"
+                    )
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.models import RegularEvent
+from events.occurrences import refresh_occurrences
+
+
+class Command(BaseCommand):
+    help = "Roll the materialized occurrences of regular events forward to the horizon"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep rolling the horizon forward every INTERVAL seconds",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.refresh(options["batch_size"])
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
+
+    def refresh(self, batch_size):
+        events = RegularEvent.objects.select_related("occurrence_days").order_by("pk")
+
+        batch, total = [], 0
+        for event in events.iterator(chunk_size=batch_size):
+            batch.append(event)
+            if len(batch) == batch_size:
+                refresh_occurrences(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            refresh_occurrences(batch)
+            total += len(batch)
+
+        self.stdout.write(f"Refreshed occurrences of {total} regular events")
@@ -0,0 +1,35 @@
+# Generated by Django 4.1.7 on 2026-10-18 11:51
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def populate_search_vector(apps, schema_editor):
+    from events.search import event_search_vector
+
+    Event = apps.get_model("events", "Event")
+    Event.objects.update(search_vector=event_search_vector())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="event_search_vector_idx"
+            ),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.1.7 on 2026-10-18 11:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0003_event_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="onetimeevent",
+            index=models.Index(
+                fields=["start_time", "event_ptr"], name="onetimeevent_start_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="onetimeevent",
+            index=models.Index(fields=["end_time"], name="onetimeevent_end_idx"),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.1.7 on 2026-10-18 11:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_occurrences(apps, schema_editor):
+    from events.occurrences import expand, horizon
+
+    EventOccurrence = apps.get_model("events", "EventOccurrence")
+    OneTimeEvent = apps.get_model("events", "OneTimeEvent")
+    RegularEvent = apps.get_model("events", "RegularEvent")
+
+    occurrences = [
+        EventOccurrence(
+            event_id=event.pk, start_time=event.start_time, end_time=event.end_time
+        )
+        for event in OneTimeEvent.objects.all()
+    ]
+    first_day, last_day = horizon()
+    for event in RegularEvent.objects.select_related("occurrence_days"):
+        occurrences.extend(
+            EventOccurrence(event_id=event.pk, start_time=start, end_time=end)
+            for start, end in expand(event, first_day, last_day)
+        )
+    EventOccurrence.objects.bulk_create(occurrences, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0004_onetimeevent_time_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventOccurrence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start_time", models.DateTimeField()),
+                ("end_time", models.DateTimeField()),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="occurrences",
+                        to="events.event",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="eventoccurrence",
+            index=models.Index(
+                fields=["start_time", "event"], name="occurrence_start_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventoccurrence",
+            index=models.Index(fields=["end_time"], name="occurrence_end_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="eventoccurrence",
+            constraint=models.UniqueConstraint(
+                fields=("event", "start_time"), name="unique_event_occurrence"
+            ),
+        ),
+        migrations.RunPython(populate_occurrences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:02
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_interests(apps, schema_editor):
+    EventInterest = apps.get_model("events", "EventInterest")
+    first = (
+        EventInterest.objects.values("user", "event")
+        .annotate(first=Min("id"))
+        .values("first")
+    )
+    EventInterest.objects.exclude(id__in=first).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0005_eventoccurrence"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_interests, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="eventinterest",
+            constraint=models.UniqueConstraint(
+                fields=("user", "event"), name="unique_event_interest"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0006_unique_event_interest"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="eventcategory",
+            index=models.Index(
+                fields=["category", "event"], name="eventcategory_category_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:06
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def populate_timelines(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    TimelineEntry = apps.get_model("events", "TimelineEntry")
+    FollowingOrganization = apps.get_model("users", "FollowingOrganization")
+
+    upcoming = (
+        Event.objects.filter(
+            moderation_status="модерация пройдена",
+            occurrences__end_time__gte=timezone.now(),
+            organization__following_count__lte=settings.TIMELINE_FANOUT_MAX_FOLLOWERS,
+        )
+        .values_list("pk", "organization_id")
+        .distinct()
+    )
+    events_by_organization = {}
+    for pk, organization_id in upcoming:
+        events_by_organization.setdefault(organization_id, []).append(pk)
+
+    follows = FollowingOrganization.objects.filter(
+        following_id__in=events_by_organization
+    ).values_list("follower_id", "following_id")
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=user_id, event_id=pk)
+            for user_id, organization_id in follows.iterator()
+            for pk in events_by_organization[organization_id]
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0004_unique_follows"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("events", "0007_eventcategory_category_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimelineEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeline_entries",
+                        to="events.event",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeline",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="timelineentry",
+            constraint=models.UniqueConstraint(
+                fields=("user", "event"), name="unique_timeline_entry"
+            ),
+        ),
+        migrations.RunPython(populate_timelines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0008_timelineentry"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="eventcomment",
+            index=models.Index(fields=["event", "-id"], name="comment_event_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0009_comment_event_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventimage",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,148 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:22
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+import django.db.models.deletion
+
+
+def remove_duplicate_links(apps, schema_editor):
+    for model_name, field in (
+        ("EventCategory", "category"),
+        ("EventPromotion", "promotion"),
+    ):
+        model = apps.get_model("events", model_name)
+        first = (
+            model.objects.values("event", field)
+            .annotate(first=Min("id"))
+            .values("first")
+        )
+        model.objects.exclude(id__in=first).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0007_query_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("events", "0010_image_variants"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="event",
+            name="organization",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="events",
+                to="users.organization",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="eventcategory",
+            name="category",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="events",
+                to="events.category",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="eventcategory",
+            name="event",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="categories",
+                to="events.event",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="eventcomment",
+            name="event",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="comments",
+                to="events.event",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="eventinterest",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="interests",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="eventoccurrence",
+            name="event",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="occurrences",
+                to="events.event",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="eventpromotion",
+            name="event",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="promotions",
+                to="events.event",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="timelineentry",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="timeline",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["organization", "-id"], name="event_organization_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("moderation_status", "на модерации")),
+                fields=["-id"],
+                name="event_pending_moderation_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventimage",
+            index=models.Index(fields=["image"], name="eventimage_image_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="regularevent",
+            index=models.Index(
+                fields=["start_time", "event_ptr"], name="regularevent_start_idx"
+            ),
+        ),
+        migrations.RunPython(remove_duplicate_links, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="eventcategory",
+            constraint=models.UniqueConstraint(
+                fields=("event", "category"), name="unique_event_category"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="eventpromotion",
+            constraint=models.UniqueConstraint(
+                fields=("event", "promotion"), name="unique_event_promotion"
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:44
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_images(apps, schema_editor):
+    EventImage = apps.get_model("events", "EventImage")
+    first = EventImage.objects.values("image").annotate(first=Min("id")).values("first")
+    EventImage.objects.exclude(id__in=first).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0011_query_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="eventimage",
+            name="eventimage_image_idx",
+        ),
+        migrations.RunPython(remove_duplicate_images, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="eventimage",
+            constraint=models.UniqueConstraint(
+                fields=("image",), name="unique_event_image"
+            ),
+        ),
+    ]
@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.exceptions import ValidationError
 from multiselectfield import MultiSelectField
@@ -54,8 +56,9 @@ class Event(models.Model):
     title = models.CharField(max_length=100)
     description = models.TextField(max_length=1000)
     price = models.PositiveIntegerField(default=0)
+    # Indexed by event_organization_idx, which also orders the events.
     organization = models.ForeignKey(
-        Organization, on_delete=models.CASCADE, related_name="events"
+        Organization, on_delete=models.CASCADE, related_name="events", db_index=False
     )
     location = models.CharField(max_length=200)
     entry = models.CharField(
@@ -64,6 +67,20 @@ class Event(models.Model):
     moderation_status = models.CharField(
         choices=MODERATION_STATUS_CHOICES, max_length=20, default="на модерации"
     )
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="event_search_vector_idx"),
+            # Organization pages list their events newest first.
+            models.Index(fields=["organization", "-id"], name="event_organization_idx"),
+            # The moderation queue is a small slice of the table.
+            models.Index(
+                fields=["-id"],
+                name="event_pending_moderation_idx",
+                condition=models.Q(moderation_status="на модерации"),
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -72,12 +89,29 @@ class Event(models.Model):
 class EventImage(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="images")
     image = models.ImageField(upload_to="images/")
+    # Filled by the process_images worker, see utils.images.
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        constraints = [
+            # A directly uploaded object belongs to one event; also the index
+            # the reuse check reads.
+            models.UniqueConstraint(fields=["image"], name="unique_event_image"),
+        ]
 
 
 class OneTimeEvent(Event):
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["start_time", "event_ptr"], name="onetimeevent_start_idx"
+            ),
+            models.Index(fields=["end_time"], name="onetimeevent_end_idx"),
+        ]
+
 
 class RegularEvent(Event):
     occurrence_days = models.ForeignKey(
@@ -90,15 +124,59 @@ class RegularEvent(Event):
     start_time = models.TimeField()
     end_time = models.TimeField()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["start_time", "event_ptr"], name="regularevent_start_idx"
+            ),
+        ]
+
+
+class EventOccurrence(models.Model):
+    # Indexed by unique_event_occurrence.
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="occurrences", db_index=False
+    )
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["start_time", "event"], name="occurrence_start_idx"),
+            models.Index(fields=["end_time"], name="occurrence_end_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "start_time"], name="unique_event_occurrence"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} - {self.start_time}"
+
 
 class EventCategory(models.Model):
+    # Both directions are served by the composite indexes below.
     event = models.ForeignKey(
-        Event, on_delete=models.CASCADE, related_name="categories"
+        Event, on_delete=models.CASCADE, related_name="categories", db_index=False
     )
     category = models.ForeignKey(
-        Category, on_delete=models.CASCADE, related_name="events"
+        Category, on_delete=models.CASCADE, related_name="events", db_index=False
     )
 
+    class Meta:
+        indexes = [
+            # Lets interest matching resolve events from the index alone.
+            models.Index(
+                fields=["category", "event"], name="eventcategory_category_idx"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "category"], name="unique_event_category"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.event.id} - {self.category.title}"
 
@@ -107,21 +185,37 @@ class EventComment(models.Model):
     user = models.ForeignKey(
         CustomUser, on_delete=models.CASCADE, related_name="comments"
     )
-    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="comments")
+    # Indexed by comment_event_idx.
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="comments", db_index=False
+    )
     text = models.CharField(max_length=500)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["event", "-id"], name="comment_event_idx"),
+        ]
+
     def __str__(self):
         return self.text
 
 
 class EventInterest(models.Model):
+    # Indexed by unique_event_interest.
     user = models.ForeignKey(
-        CustomUser, on_delete=models.CASCADE, related_name="interests"
+        CustomUser, on_delete=models.CASCADE, related_name="interests", db_index=False
     )
     event = models.ForeignKey(
         Event, on_delete=models.CASCADE, related_name="interested"
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "event"], name="unique_event_interest"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user.id} - {self.event.id}"
 
@@ -135,12 +229,43 @@ class PromotionType(models.Model):
 
 
 class EventPromotion(models.Model):
+    # Indexed by unique_event_promotion.
     event = models.ForeignKey(
-        Event, on_delete=models.CASCADE, related_name="promotions"
+        Event, on_delete=models.CASCADE, related_name="promotions", db_index=False
     )
     promotion = models.ForeignKey(
         PromotionType, on_delete=models.CASCADE, related_name="events"
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "promotion"], name="unique_event_promotion"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.event.id} - {self.promotion.id}"
+
+
+class TimelineEntry(models.Model):
+    """An event of a followed organization, fanned out to a follower's inbox."""
+
+    # Indexed by unique_timeline_entry.
+    user = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name="timeline", db_index=False
+    )
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+
+    class Meta:
+        constraints = [
+            # Also the (user, event) index timelines are read from.
+            models.UniqueConstraint(
+                fields=["user", "event"], name="unique_timeline_entry"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.event_id}"
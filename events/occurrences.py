@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from events.models import EventOccurrence, OneTimeEvent, RegularEvent
+
+try:
+    import zoneinfo
+except ImportError:
+    from backports import zoneinfo
+
+WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
+
+def local_timezone():
+    return zoneinfo.ZoneInfo(settings.EVENTS_TIME_ZONE)
+
+
+def local_midnight(day):
+    return datetime.combine(day, time.min, tzinfo=local_timezone())
+
+
+def horizon(now=None):
+    """Local days ``[today, today + EVENTS_OCCURRENCE_HORIZON_WEEKS)``."""
+    today = (now or timezone.now()).astimezone(local_timezone()).date()
+    return today, today + timedelta(weeks=settings.EVENTS_OCCURRENCE_HORIZON_WEEKS)
+
+
+def expand(event, first_day, last_day):
+    """
+    ``(start, end)`` pairs of a regular event on the local days
+    ``[first_day, last_day)``. Events ending at or before their start time
+    are treated as running past midnight.
+    """
+    days = event.occurrence_days
+    if days is None:
+        return []
+
+    start_time = _field_value(event, "start_time")
+    end_time = _field_value(event, "end_time")
+    duration = datetime.combine(first_day, end_time) - datetime.combine(
+        first_day, start_time
+    )
+    if duration <= timedelta(0):
+        duration += timedelta(days=1)
+
+    occurrences = []
+    day = first_day
+    while day < last_day:
+        if getattr(days, WEEKDAYS[day.weekday()]):
+            start = datetime.combine(day, start_time, tzinfo=local_timezone())
+            occurrences.append((start, start + duration))
+        day += timedelta(days=1)
+    return occurrences
+
+
+def refresh_occurrences(events, now=None):
+    """
+    Rebuild the materialized occurrences of ``events``.
+
+    One-time events get exactly one row. Regular events get a row per day
+    in the rolling horizon; rows before today are kept as history.
+    """
+    first_day, last_day = horizon(now)
+    onetime_ids, regular_ids, occurrences = [], [], []
+
+    for event in events:
+        if isinstance(event, OneTimeEvent):
+            onetime_ids.append(event.pk)
+            pairs = [
+                (_field_value(event, "start_time"), _field_value(event, "end_time"))
+            ]
+        elif isinstance(event, RegularEvent):
+            regular_ids.append(event.pk)
+            pairs = expand(event, first_day, last_day)
+        else:
+            continue
+        occurrences.extend(
+            EventOccurrence(event_id=event.pk, start_time=start, end_time=end)
+            for start, end in pairs
+        )
+
+    with transaction.atomic():
+        if onetime_ids:
+            EventOccurrence.objects.filter(event_id__in=onetime_ids).delete()
+        if regular_ids:
+            EventOccurrence.objects.filter(
+                event_id__in=regular_ids, start_time__gte=local_midnight(first_day)
+            ).delete()
+        EventOccurrence.objects.bulk_create(occurrences, ignore_conflicts=True)
+
+
+def _field_value(event, name):
+    return event._meta.get_field(name).to_python(getattr(event, name))
@@ -0,0 +1,45 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, OuterRef, Subquery
+
+from users.models import Organization
+
+SEARCH_CONFIGS = ("russian", "simple")
+
+
+def event_search_vector():
+    """
+    Weighted document for an event: title > description > organization name.
+
+    Every part is indexed with the russian stemmer and with the ``simple``
+    configuration, so both word forms and exact (e.g. latin) tokens match.
+    """
+    organization_name = Subquery(
+        Organization.objects.filter(pk=OuterRef("organization_id")).values("name")[:1]
+    )
+    vector = None
+    for value, weight in (
+        ("title", "A"),
+        ("description", "B"),
+        (organization_name, "C"),
+    ):
+        for config in SEARCH_CONFIGS:
+            part = SearchVector(value, config=config, weight=weight)
+            vector = part if vector is None else vector + part
+    return vector
+
+
+def event_search_query(keyword: str):
+    query = None
+    for config in SEARCH_CONFIGS:
+        part = SearchQuery(keyword, config=config, search_type="websearch")
+        query = part if query is None else query | part
+    return query
+
+
+def event_search_rank(query):
+    return SearchRank(F("search_vector"), query)
+
+
+def update_search_vector(events):
+    """Recompute ``search_vector`` for the given ``Event`` queryset in one UPDATE."""
+    return events.update(search_vector=event_search_vector())
@@ -1,7 +1,12 @@
 from abc import ABC
-from django.db import transaction
+from typing import Dict, List
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from datetime import datetime
 
+from django.conf import settings
 from rest_framework import serializers
 from events.models import (
     OneTimeEvent,
@@ -17,6 +22,11 @@ from events.models import (
     OccurrenceDays,
 )
 from users.models import Organization
+from utils.cache import CATEGORIES, invalidate
+from utils.db.prefetch import EagerLoadingMixin
+from utils.images import ImageVariantsField
+from utils.db.queries import load_event_children
+from utils.uploads import UPLOAD_CONTENT_TYPES, get_upload_backend
 
 
 class UnixTimestampField(serializers.Field, ABC):
@@ -31,9 +41,10 @@ class UnixTimestampField(serializers.Field, ABC):
             self.fail("invalid")
 
 
-class EventCommentSerializer(serializers.ModelSerializer):
+class EventCommentSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     username = serializers.SerializerMethodField()
     event = serializers.StringRelatedField()
+    select_related_fields = ("user__customer", "event")
 
     class Meta:
         model = EventComment
@@ -54,8 +65,9 @@ class EventCommentSerializer(serializers.ModelSerializer):
         return obj.user.customer.username
 
 
-class EventCommentInlineSerializer(serializers.ModelSerializer):
+class EventCommentInlineSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     username = serializers.SerializerMethodField()
+    select_related_fields = ("user__customer",)
 
     class Meta:
         model = EventComment
@@ -66,8 +78,9 @@ class EventCommentInlineSerializer(serializers.ModelSerializer):
         return obj.user.customer.username
 
 
-class EventInterestSerializer(serializers.ModelSerializer):
+class EventInterestSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField()
+    select_related_fields = ("user",)
 
     class Meta:
         model = EventInterest
@@ -80,8 +93,9 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ("id", "title")
 
 
-class EventCategorySerializer(serializers.ModelSerializer):
+class EventCategorySerializer(EagerLoadingMixin, serializers.ModelSerializer):
     id = serializers.SerializerMethodField()
+    select_related_fields = ("category",)
 
     @staticmethod
     def get_id(obj) -> int:
@@ -97,8 +111,9 @@ class EventCategorySerializer(serializers.ModelSerializer):
         return repr
 
 
-class EventPromotionSerializer(serializers.ModelSerializer):
+class EventPromotionSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     id = serializers.SerializerMethodField()
+    select_related_fields = ("promotion",)
 
     @staticmethod
     def get_id(obj) -> int:
@@ -114,15 +129,125 @@ class EventPromotionSerializer(serializers.ModelSerializer):
         return repr
 
 
-class OneTimeEventSerializer(serializers.ModelSerializer):
+class EventImageInlineSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    image = serializers.ImageField()
+    variants = ImageVariantsField("image")
+
+    class Meta:
+        model = EventImage
+        fields = ("image", "variants")
+
+
+class EventListSerializer(serializers.ListSerializer):
+    """Resolves the current user's interests for a whole page in one query."""
+
+    def to_representation(self, data):
+        events = list(data.all() if hasattr(data, "all") else data)
+        request = self.context.get("request")
+        interested_ids = set()
+        if request and request.user.is_authenticated and events:
+            interested_ids = set(
+                EventInterest.objects.filter(
+                    user=request.user, event_id__in=[event.pk for event in events]
+                ).values_list("event_id", flat=True)
+            )
+        self.child.interested_ids = interested_ids
+        return super().to_representation(events)
+
+
+class EventInterestStateMixin(serializers.Serializer):
+    interested_count = serializers.SerializerMethodField()
+    is_interested = serializers.SerializerMethodField()
+
+    @classmethod
+    def get_annotations(cls):
+        interested = (
+            EventInterest.objects.filter(event=OuterRef("pk"))
+            .order_by()
+            .values("event")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return {
+            **super().get_annotations(),
+            "interested_count": Coalesce(
+                Subquery(interested, output_field=IntegerField()), 0
+            ),
+        }
+
+    @staticmethod
+    def get_interested_count(obj) -> int:
+        if hasattr(obj, "interested_count"):
+            return obj.interested_count
+        return obj.interested.count()
+
+    def get_is_interested(self, obj) -> bool:
+        interested_ids = getattr(self, "interested_ids", None)
+        if interested_ids is not None:
+            return obj.pk in interested_ids
+
+        request = self.context.get("request")
+        if not request or not request.user.is_authenticated:
+            return False
+        return obj.interested.filter(user=request.user).exists()
+
+
+class EventCommentsPreviewMixin(serializers.Serializer):
+    """The comment count and the latest few comments; the rest are paginated."""
+
+    comments_count = serializers.SerializerMethodField()
+    comments = serializers.SerializerMethodField()
+    comments_preview_size = 3
+
+    @classmethod
+    def get_annotations(cls):
+        comments = (
+            EventComment.objects.filter(event=OuterRef("pk"))
+            .order_by()
+            .values("event")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return {
+            **super().get_annotations(),
+            "comments_count": Coalesce(
+                Subquery(comments, output_field=IntegerField()), 0
+            ),
+        }
+
+    @staticmethod
+    def get_comments_count(obj) -> int:
+        if hasattr(obj, "comments_count"):
+            return obj.comments_count
+        return obj.comments.count()
+
+    def get_comments(self, obj) -> List[Dict]:
+        comments = EventCommentInlineSerializer.setup_eager_loading(
+            obj.comments.order_by("-id")
+        )
+        return EventCommentInlineSerializer(
+            comments[: self.comments_preview_size], many=True
+        ).data
+
+
+class OneTimeEventSerializer(
+    EventInterestStateMixin, EagerLoadingMixin, serializers.ModelSerializer
+):
     categories = EventCategorySerializer(many=True, read_only=True)
-    interested = EventInterestSerializer(many=True, read_only=True)
     promotions = EventPromotionSerializer(many=True, read_only=True)
+    images = EventImageInlineSerializer(many=True, read_only=True)
     organization = serializers.StringRelatedField()
     start_time = UnixTimestampField()
+    select_related_fields = ("organization",)
+    prefetch_related_fields = (
+        ("categories", EventCategorySerializer),
+        ("promotions", EventPromotionSerializer),
+        ("images", EventImageInlineSerializer),
+    )
 
     class Meta:
         model = OneTimeEvent
+        list_serializer_class = EventListSerializer
         fields = (
             "id",
             "title",
@@ -130,14 +255,17 @@ class OneTimeEventSerializer(serializers.ModelSerializer):
             "location",
             "start_time",
             "categories",
-            "interested",
+            "interested_count",
+            "is_interested",
             "promotions",
+            "images",
         )
 
 
 class OneTimeEventProfileSerializer(OneTimeEventSerializer):
     class Meta:
         model = OneTimeEvent
+        list_serializer_class = EventListSerializer
         fields = (
             "id",
             "title",
@@ -145,20 +273,32 @@ class OneTimeEventProfileSerializer(OneTimeEventSerializer):
             "location",
             "start_time",
             "categories",
-            "interested",
+            "interested_count",
+            "is_interested",
             "promotions",
+            "images",
             "moderation_status",
         )
 
 
-class OneTimeEventDetailSerializer(serializers.ModelSerializer):
+class OneTimeEventDetailSerializer(
+    EventCommentsPreviewMixin,
+    EventInterestStateMixin,
+    EagerLoadingMixin,
+    serializers.ModelSerializer,
+):
     categories = EventCategorySerializer(many=True, read_only=True)
-    comments = EventCommentInlineSerializer(many=True, read_only=True)
-    interested = EventInterestSerializer(many=True, read_only=True)
     promotions = EventPromotionSerializer(many=True, read_only=True)
+    images = EventImageInlineSerializer(many=True, read_only=True)
     organization = serializers.StringRelatedField()
     start_time = UnixTimestampField()
     end_time = UnixTimestampField()
+    select_related_fields = ("organization",)
+    prefetch_related_fields = (
+        ("categories", EventCategorySerializer),
+        ("promotions", EventPromotionSerializer),
+        ("images", EventImageInlineSerializer),
+    )
 
     class Meta:
         model = OneTimeEvent
@@ -173,22 +313,34 @@ class OneTimeEventDetailSerializer(serializers.ModelSerializer):
             "start_time",
             "end_time",
             "categories",
+            "comments_count",
             "comments",
-            "interested",
+            "interested_count",
+            "is_interested",
             "promotions",
+            "images",
         )
 
 
-class RegularEventSerializer(serializers.ModelSerializer):
+class RegularEventSerializer(
+    EventInterestStateMixin, EagerLoadingMixin, serializers.ModelSerializer
+):
     categories = EventCategorySerializer(many=True, read_only=True)
-    interested = EventInterestSerializer(many=True, read_only=True)
     promotions = EventPromotionSerializer(many=True, read_only=True)
+    images = EventImageInlineSerializer(many=True, read_only=True)
     organization = serializers.StringRelatedField()
     occurrence_days = serializers.StringRelatedField()
     start_time = serializers.SerializerMethodField()
+    select_related_fields = ("organization", "occurrence_days")
+    prefetch_related_fields = (
+        ("categories", EventCategorySerializer),
+        ("promotions", EventPromotionSerializer),
+        ("images", EventImageInlineSerializer),
+    )
 
     class Meta:
         model = RegularEvent
+        list_serializer_class = EventListSerializer
         fields = (
             "id",
             "title",
@@ -197,8 +349,10 @@ class RegularEventSerializer(serializers.ModelSerializer):
             "occurrence_days",
             "start_time",
             "categories",
-            "interested",
+            "interested_count",
+            "is_interested",
             "promotions",
+            "images",
         )
 
     @staticmethod
@@ -209,6 +363,7 @@ class RegularEventSerializer(serializers.ModelSerializer):
 class RegularEventProfileSerializer(RegularEventSerializer):
     class Meta:
         model = RegularEvent
+        list_serializer_class = EventListSerializer
         fields = (
             "id",
             "title",
@@ -217,21 +372,98 @@ class RegularEventProfileSerializer(RegularEventSerializer):
             "occurrence_days",
             "start_time",
             "categories",
-            "interested",
+            "interested_count",
+            "is_interested",
             "promotions",
+            "images",
             "moderation_status",
         )
 
 
-class RegularEventDetailSerializer(serializers.ModelSerializer):
+class PolymorphicEventListSerializer(serializers.ListSerializer):
+    """
+    Loads the child rows of a page of base events with one query per event
+    type and serializes each type's group in a single batch.
+    """
+
+    def to_representation(self, data):
+        serializers_by_type = self.child.serializers
+        events = load_event_children(
+            data.all() if hasattr(data, "all") else data,
+            plans={
+                event_type: serializer.setup_eager_loading
+                for event_type, serializer in serializers_by_type.items()
+            },
+        )
+
+        groups = {}
+        for event in events:
+            groups.setdefault(event.event_type, []).append(event)
+
+        representations = {}
+        for event_type, group in groups.items():
+            serializer = serializers_by_type[event_type](
+                group, many=True, context=self.context
+            )
+            for event, representation in zip(group, serializer.data):
+                representations[event.pk] = self.child.tag(event, representation)
+        return [representations[event.pk] for event in events]
+
+
+class PolymorphicEventSerializer(serializers.BaseSerializer):
+    """Read-only representation of one-time and regular events side by side."""
+
+    serializers = {
+        "onetime": OneTimeEventSerializer,
+        "regular": RegularEventSerializer,
+    }
+
+    class Meta:
+        list_serializer_class = PolymorphicEventListSerializer
+
+    def to_representation(self, instance):
+        serializer = self.serializers[instance.event_type](
+            instance, context=self.context
+        )
+        return self.tag(instance, serializer.data)
+
+    @staticmethod
+    def tag(event, representation):
+        representation["event_type"] = event.event_type
+        if hasattr(event, "next_occurrence"):
+            next_occurrence = event.next_occurrence
+            representation["next_occurrence"] = (
+                int(next_occurrence.timestamp()) if next_occurrence else None
+            )
+        return representation
+
+
+class PolymorphicEventProfileSerializer(PolymorphicEventSerializer):
+    serializers = {
+        "onetime": OneTimeEventProfileSerializer,
+        "regular": RegularEventProfileSerializer,
+    }
+
+
+class RegularEventDetailSerializer(
+    EventCommentsPreviewMixin,
+    EventInterestStateMixin,
+    EagerLoadingMixin,
+    serializers.ModelSerializer,
+):
     categories = EventCategorySerializer(many=True, read_only=True)
-    comments = EventCommentSerializer(many=True, read_only=True)
-    interested = EventInterestSerializer(many=True, read_only=True)
     promotions = EventPromotionSerializer(many=True, read_only=True)
+    images = EventImageInlineSerializer(many=True, read_only=True)
     organization = serializers.StringRelatedField()
     occurrence_days = serializers.StringRelatedField()
     start_time = serializers.SerializerMethodField()
     end_time = serializers.SerializerMethodField()
+    select_related_fields = ("organization", "occurrence_days")
+    prefetch_related_fields = (
+        ("categories", EventCategorySerializer),
+        ("promotions", EventPromotionSerializer),
+        ("images", EventImageInlineSerializer),
+    )
 
     class Meta:
         model = RegularEvent
@@ -247,9 +479,12 @@ class RegularEventDetailSerializer(serializers.ModelSerializer):
             "start_time",
             "end_time",
             "categories",
+            "comments_count",
             "comments",
-            "interested",
+            "interested_count",
+            "is_interested",
             "promotions",
+            "images",
         )
 
     @staticmethod
@@ -261,20 +496,31 @@ class RegularEventDetailSerializer(serializers.ModelSerializer):
         return obj.end_time.strftime("%H:%M")
 
 
-class EventImageInlineSerializer(serializers.ModelSerializer):
-    image = serializers.ImageField()
-
-    class Meta:
-        model = EventImage
-        fields = ("image",)
-
-
 class CategoryInlineSerializer:
     class Meta:
         model = Category
         fields = ("title",)
 
 
+class ImageUploadSerializer(serializers.Serializer):
+    content_type = serializers.ChoiceField(
+        choices=list(UPLOAD_CONTENT_TYPES), write_only=True
+    )
+    size = serializers.IntegerField(min_value=1, write_only=True)
+    key = serializers.CharField(read_only=True)
+    method = serializers.CharField(read_only=True)
+    url = serializers.CharField(read_only=True)
+    # Extra form fields to send along with a POST upload (presigned S3 policy).
+    form_fields = serializers.DictField(child=serializers.CharField(), read_only=True)
+
+    def validate_size(self, value):
+        if value > settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Images are limited to {settings.UPLOAD_MAX_SIZE} bytes"
+            )
+        return value
+
+
 class EventCreateSerializer(serializers.ModelSerializer):
     promotions = serializers.ListField(
         child=serializers.CharField(), required=False, write_only=True
@@ -285,6 +531,13 @@ class EventCreateSerializer(serializers.ModelSerializer):
         allow_empty=True,
         write_only=True,
     )
+    image_keys = serializers.ListField(
+        child=serializers.CharField(),
+        required=False,
+        max_length=10,
+        write_only=True,
+        help_text="Keys of images uploaded through the presigned upload URLs.",
+    )
     categories = serializers.ListField(
         child=serializers.CharField(), required=False, write_only=True
     )
@@ -301,71 +554,136 @@ class EventCreateSerializer(serializers.ModelSerializer):
             "entry",
             "organization",
             "images",
+            "image_keys",
             "categories",
             "promotions",
         )
 
     def validate_promotions(self, value):
-        value = value[0].split(",")
-        for prom in value:
-            if not PromotionType.objects.filter(title=prom).exists():
+        return self.resolve_titles(
+            PromotionType,
+            value,
+            "{} promotion type either is disabled or does not exist",
+        )
+
+    def validate_categories(self, value):
+        return self.resolve_titles(Category, value, "{} is not an existing category")
+
+    def validate_image_keys(self, value):
+        """
+        Accept only keys issued to this organization whose objects were
+        actually uploaded and stay within the size limit.
+        """
+        prefix = f"uploads/{self.context['view'].kwargs.get('pk')}/"
+        keys = list(dict.fromkeys(value))
+        for key in keys:
+            extension = key[key.rfind(".") :]
+            if (
+                not key.startswith(prefix)
+                or "/" in key[len(prefix) :]
+                or extension not in UPLOAD_CONTENT_TYPES.values()
+            ):
                 raise serializers.ValidationError(
-                    {
-                        "Detail": f"{prom} promotion type either is disabled or does not exist"
-                    }
+                    {"Detail": f"{key} is not a valid key"}
                 )
-        return value
+        if EventImage.objects.filter(image__in=keys).exists():
+            raise serializers.ValidationError(
+                {"Detail": "An uploaded image can only be used once"}
+            )
 
-    def validate_categories(self, value):
-        value = value[0].split(",")
-        for cat in value:
-            if not Category.objects.filter(title=cat).exists():
+        backend = get_upload_backend()
+        for key in keys:
+            size = backend.size(key)
+            if size is None:
                 raise serializers.ValidationError(
-                    {"Detail": f"{cat} is not an existing category"}
+                    {"Detail": f"{key} has not been uploaded"}
                 )
-        return value
+            if size > settings.UPLOAD_MAX_SIZE:
+                raise serializers.ValidationError({"Detail": f"{key} is too large"})
+        return keys
+
+    @staticmethod
+    def resolve_titles(model, value, error):
+        """
+        Turn the comma separated titles into ``model`` instances with a single
+        query; creation reuses the instances instead of looking them up again.
+        """
+        titles = list(dict.fromkeys(t for item in value for t in item.split(",")))
+        found = {obj.title: obj for obj in model.objects.filter(title__in=titles)}
+        for title in titles:
+            if title not in found:
+                raise serializers.ValidationError({"Detail": error.format(title)})
+        return [found[title] for title in titles]
 
     def create(self, validated_data):
-        promotions_data = validated_data.pop("promotions", [])
+        promotions = validated_data.pop("promotions", [])
         images_data = validated_data.pop("images", [])
-        categories_data = validated_data.pop("categories", [])
-
-        with transaction.atomic():
-            event = self.Meta.model.objects.create(**validated_data)
-
-            event_images = [
-                EventImage(event=event, image=image_data) for image_data in images_data
-            ]
-            EventImage.objects.bulk_create(event_images)
-
-            categories = []
-            for category_data in categories_data:
-                categories.append(Category.objects.get(title=category_data))
-            event_categories = [
-                EventCategory(event=event, category=category_data)
-                for category_data in categories
-            ]
-            EventCategory.objects.bulk_create(event_categories)
+        image_keys = validated_data.pop("image_keys", [])
+        categories = validated_data.pop("categories", [])
 
-            promotions = []
-            for promotion_data in promotions_data:
-                promotions.append(PromotionType.objects.get(title=promotion_data))
-
-            event_promotions = [
-                EventPromotion(event=event, promotion=promotion_data)
-                for promotion_data in promotions
-            ]
-            EventPromotion.objects.bulk_create(event_promotions)
+        try:
+            with transaction.atomic():
+                event = self.Meta.model.objects.create(**validated_data)
+
+                event_images = [
+                    EventImage(event=event, image=image_data)
+                    for image_data in images_data
+                ]
+                # Already in storage: only the key is recorded, nothing is copied.
+                event_images += [
+                    EventImage(event=event, image=key) for key in image_keys
+                ]
+                EventImage.objects.bulk_create(event_images)
+
+                EventCategory.objects.bulk_create(
+                    [
+                        EventCategory(event=event, category=category)
+                        for category in categories
+                    ]
+                )
+                EventPromotion.objects.bulk_create(
+                    [
+                        EventPromotion(event=event, promotion=promotion)
+                        for promotion in promotions
+                    ]
+                )
+                if categories:
+                    # bulk_create skips the signals that keep the category list fresh
+                    invalidate(CATEGORIES)
+        except IntegrityError as error:
+            if "unique_event_image" not in str(error):
+                raise
+            # A concurrent request attached the same upload after validation.
+            raise serializers.ValidationError(
+                {"Detail": "An uploaded image can only be used once"}
+            )
 
-            return event
+        # Kept for to_representation, which then needs no queries.
+        event.created_related = {
+            "categories": [category.title for category in categories],
+            "promotions": [promotion.title for promotion in promotions],
+            "images": [image.image.url for image in event_images],
+        }
+        return event
 
     def to_representation(self, instance):
         repr = super().to_representation(instance)
+        created_related = getattr(instance, "created_related", None)
+        if created_related is not None:
+            repr.update(created_related)
+            return repr
+
         repr["categories"] = [
-            cat.category.title for cat in EventCategory.objects.filter(event=instance)
+            cat.category.title
+            for cat in EventCategory.objects.filter(event=instance).select_related(
+                "category"
+            )
         ]
         repr["promotions"] = [
-            cat.promotion.title for cat in EventPromotion.objects.filter(event=instance)
+            cat.promotion.title
+            for cat in EventPromotion.objects.filter(event=instance).select_related(
+                "promotion"
+            )
         ]
         repr["images"] = [
             cat.image.url for cat in EventImage.objects.filter(event=instance)
@@ -390,6 +708,7 @@ class OneTimeEventCreateSerializer(EventCreateSerializer):
             "end_time",
             "organization",
             "images",
+            "image_keys",
             "categories",
             "promotions",
         )
@@ -415,6 +734,7 @@ class RegularEventCreateSerializer(EventCreateSerializer):
             "end_time",
             "organization",
             "images",
+            "image_keys",
             "categories",
             "promotions",
             "occurrence_days",
@@ -441,7 +761,6 @@ class RegularEventCreateSerializer(EventCreateSerializer):
         return super().create(validated_data)
 
     def to_representation(self, instance):
-        print(instance.occurrence_days)
         repr = super().to_representation(instance)
 
         repr["occurrence_days"] = str(instance.occurrence_days).split(", ")
@@ -0,0 +1,100 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from events.models import (
+    Category,
+    Event,
+    EventCategory,
+    EventImage,
+    EventInterest,
+    EventPromotion,
+    OccurrenceDays,
+    OneTimeEvent,
+    RegularEvent,
+)
+from events.occurrences import refresh_occurrences
+from events.search import update_search_vector
+from events.timeline import fan_out
+from users.models import Organization
+from utils.cache import CATEGORIES, EVENTS, invalidate
+from utils.images import reset_stale_variants
+
+MODERATED = "модерация пройдена"
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=OneTimeEvent)
+@receiver(post_save, sender=RegularEvent)
+def refresh_event_search_vector(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    update_search_vector(Event.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Organization)
+def refresh_organization_events_search_vector(
+    sender, instance, created=False, raw=False, update_fields=None, **kwargs
+):
+    if raw or created or (update_fields and "name" not in update_fields):
+        return
+    update_search_vector(Event.objects.filter(organization=instance))
+
+
+@receiver(post_save, sender=OneTimeEvent)
+@receiver(post_save, sender=RegularEvent)
+def refresh_event_occurrences(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    refresh_occurrences([instance])
+
+
+@receiver(post_save, sender=OccurrenceDays)
+def refresh_schedule_occurrences(sender, instance, created=False, raw=False, **kwargs):
+    if raw or created:
+        return
+    refresh_occurrences(instance.events.select_related("occurrence_days"))
+
+
+@receiver(pre_save, sender=Event)
+@receiver(pre_save, sender=OneTimeEvent)
+@receiver(pre_save, sender=RegularEvent)
+def remember_moderation_status(sender, instance, raw=False, **kwargs):
+    # Only looked up when the saved status could be a transition to moderated.
+    instance._was_moderated = (
+        not raw
+        and instance.moderation_status == MODERATED
+        and instance.pk is not None
+        and Event.objects.filter(pk=instance.pk, moderation_status=MODERATED).exists()
+    )
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=OneTimeEvent)
+@receiver(post_save, sender=RegularEvent)
+def fan_out_moderated_event(sender, instance, raw=False, **kwargs):
+    if raw or instance.moderation_status != MODERATED:
+        return
+    if not getattr(instance, "_was_moderated", False):
+        fan_out(instance)
+
+
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=OneTimeEvent)
+@receiver([post_save, post_delete], sender=RegularEvent)
+@receiver([post_save, post_delete], sender=EventInterest)
+@receiver([post_save, post_delete], sender=EventPromotion)
+@receiver([post_save, post_delete], sender=OccurrenceDays)
+def invalidate_cached_events(sender, **kwargs):
+    invalidate(EVENTS)
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=EventCategory)
+def invalidate_cached_categories(sender, **kwargs):
+    invalidate(EVENTS, CATEGORIES)
+
+
+@receiver(pre_save, sender=EventImage)
+def reset_event_image_variants(sender, instance, raw=False, **kwargs):
+    if not raw:
+        reset_stale_variants(instance, "image")
@@ -0,0 +1,86 @@
+import asyncio
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from events.models import Category, EventCategory
+from utils.testing import MODERATED, create_event, create_organization
+
+
+class AsyncReadPathTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = create_organization()
+        now = timezone.now()
+        cls.events = [
+            create_event(
+                cls.organization,
+                f"Event {i}",
+                now + timedelta(days=i),
+                moderation_status=MODERATED,
+            )
+            for i in range(3)
+        ]
+        music = Category.objects.create(title="Music")
+        Category.objects.create(title="Empty")
+        EventCategory.objects.create(event=cls.events[0], category=music)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_hot_read_views_are_coroutines(self):
+        urls = [
+            reverse("events"),
+            reverse("onetime-events"),
+            reverse("regular-events"),
+            reverse("categories"),
+            reverse("onetime-events-detail", kwargs={"pk": self.events[0].pk}),
+            reverse("organization-list"),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertTrue(asyncio.iscoroutinefunction(resolve(url).func))
+
+    async def test_event_list_pages(self):
+        response = await self.async_client.get(reverse("onetime-events"), {"limit": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 3)
+        self.assertEqual(len(response.json()["results"]), 2)
+
+        response = await self.async_client.get(
+            reverse("onetime-events"), {"page_size": 2}
+        )
+        page = response.json()
+        self.assertEqual(len(page["results"]), 2)
+        self.assertIsNotNone(page["next"])
+
+    async def test_event_detail(self):
+        event = self.events[0]
+        url = reverse("onetime-events-detail", kwargs={"pk": event.pk})
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], event.title)
+
+        url = reverse("onetime-events-detail", kwargs={"pk": 0})
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_categories(self):
+        response = await self.async_client.get(reverse("categories"))
+        self.assertEqual([c["title"] for c in response.json()], ["Music", "Empty"])
+
+        response = await self.async_client.get(
+            reverse("categories"), {"is_not_empty": "true"}
+        )
+        self.assertEqual([c["title"] for c in response.json()], ["Music"])
+
+    async def test_organization_list(self):
+        response = await self.async_client.get(
+            reverse("organization-list"), {"keyword": "Test"}
+        )
+        self.assertEqual(response.status_code, 200)
+        (organization,) = response.json()["results"]
+        self.assertEqual(organization["name"], self.organization.name)
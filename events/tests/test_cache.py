@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from events.models import EventInterest
+from utils.testing import MODERATED, create_event, create_organization
+
+
+class ResponseCacheTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = create_organization()
+        cls.user = cls.organization.user
+        cls.event = create_event(
+            cls.organization, duration=timedelta(hours=1), moderation_status=MODERATED
+        )
+        cls.url = reverse("onetime-events")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_repeated_request_skips_database(self):
+        first = self.client.get(self.url, {"limit": 5, "offset": 0})
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url + "?offset=0&limit=5")
+        self.assertEqual(second.data, first.data)
+
+    def test_writes_invalidate_listing(self):
+        self.client.get(self.url)
+        EventInterest.objects.create(user=self.user, event=self.event)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["results"][0]["interested_count"], 1)
+
+        self.client.get(reverse("organization-list"))
+        self.organization.name = "Renamed"
+        self.organization.save()
+        response = self.client.get(reverse("organization-list"))
+        self.assertEqual(response.data["results"][0]["name"], "Renamed")
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["results"][0]["organization"], "Renamed")
+
+    def test_authenticated_requests_are_not_cached(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertTrue(context.captured_queries)
+        self.assertFalse(response.data["results"][0]["is_interested"])
@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from events.models import EventComment
+from users.models import CustomUser, Customer
+from utils.testing import create_event, create_organization
+
+
+class EventCommentTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organization = create_organization()
+        cls.event = create_event(organization, duration=timedelta(hours=1))
+        cls.customers = []
+        for i in range(5):
+            user = CustomUser.objects.create(email=f"user{i}@test.com", password="foo")
+            cls.customers.append(
+                Customer.objects.create(user=user, username=f"user{i}")
+            )
+        for i in range(7):
+            EventComment.objects.create(
+                user=cls.customers[i % 5].user, event=cls.event, text=f"Comment {i}"
+            )
+
+    def test_detail_carries_count_and_latest(self):
+        url = reverse("onetime-events-detail", kwargs={"pk": self.event.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.data["comments_count"], 7)
+        self.assertEqual(
+            [comment["text"] for comment in response.data["comments"]],
+            ["Comment 6", "Comment 5", "Comment 4"],
+        )
+
+    def test_comments_are_cursor_paginated(self):
+        url = reverse("event-comments", kwargs={"pk": self.event.pk})
+        texts = []
+        url += "?page_size=3"
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(len(context), 1)
+            texts.extend(comment["text"] for comment in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(texts, [f"Comment {i}" for i in reversed(range(7))])
+        self.assertEqual(response.data["results"][0]["username"], "user0")
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from events.models import (
+    Category,
+    EventCategory,
+    EventComment,
+    EventInterest,
+    EventPromotion,
+    OccurrenceDays,
+    OneTimeEvent,
+    PromotionType,
+    RegularEvent,
+)
+from users.models import CustomUser, Customer
+from utils.testing import create_organization
+
+
+class EagerLoadingTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = create_organization()
+        cls.category = Category.objects.create(title="Charity")
+        cls.promotion = PromotionType.objects.create(title="Top", price=100)
+        cls.customers = []
+        for i in range(3):
+            user = CustomUser.objects.create(email=f"user{i}@test.com", password="foo")
+            cls.customers.append(
+                Customer.objects.create(user=user, username=f"user{i}")
+            )
+        cls.days = OccurrenceDays.objects.create(monday=True)
+
+    def create_events(self, model, count, **fields):
+        now = timezone.now()
+        events = []
+        for i in range(count):
+            if model is OneTimeEvent:
+                fields.update(start_time=now, end_time=now + timedelta(hours=1))
+            event = model.objects.create(
+                title=f"Event {i}",
+                description="",
+                organization=self.organization,
+                location="Bishkek",
+                **fields,
+            )
+            EventCategory.objects.create(event=event, category=self.category)
+            EventPromotion.objects.create(event=event, promotion=self.promotion)
+            for customer in self.customers:
+                EventInterest.objects.create(user=customer.user, event=event)
+                EventComment.objects.create(user=customer.user, event=event, text="Hi")
+            events.append(event)
+        return events
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_onetime_list_is_constant(self):
+        self.create_events(OneTimeEvent, 1)
+        single = self.count_queries(reverse("onetime-events"))
+        self.create_events(OneTimeEvent, 10)
+        self.assertEqual(self.count_queries(reverse("onetime-events")), single)
+
+    def test_regular_list_is_constant(self):
+        regular = dict(occurrence_days=self.days, start_time="10:00", end_time="11:00")
+        self.create_events(RegularEvent, 1, **regular)
+        single = self.count_queries(reverse("regular-events"))
+        self.create_events(RegularEvent, 10, **regular)
+        self.assertEqual(self.count_queries(reverse("regular-events")), single)
+
+    def test_detail_does_not_grow_with_comments(self):
+        (event,) = self.create_events(OneTimeEvent, 1)
+        url = reverse("onetime-events-detail", kwargs={"pk": event.pk})
+        few = self.count_queries(url)
+        for customer in self.customers:
+            EventComment.objects.create(user=customer.user, event=event, text="Again")
+        self.assertEqual(self.count_queries(url), few)
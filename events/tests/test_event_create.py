@@ -0,0 +1,61 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from events.models import Category, EventCategory, EventPromotion, PromotionType
+from utils.testing import create_organization
+
+
+class EventCreateTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = create_organization()
+        cls.categories = [
+            Category.objects.create(title=title) for title in ("Music", "Art", "Kids")
+        ]
+        cls.promotions = [
+            PromotionType.objects.create(title=title, price=100)
+            for title in ("Top", "Banner", "Push")
+        ]
+        cls.url = reverse("regular-event-create", kwargs={"pk": cls.organization.pk})
+
+    def create(self, categories, promotions):
+        self.client.force_authenticate(self.organization.user)
+        data = {
+            "title": "Event",
+            "description": "Weekly",
+            "location": "Bishkek",
+            "start_time": "10:00",
+            "end_time": "12:00",
+            "occurrence_days": "monday,friday",
+            "images": "",
+            "categories": ",".join(categories),
+            "promotions": ",".join(promotions),
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, data, format="multipart")
+        return response, len(context)
+
+    def test_query_count_does_not_grow_with_titles(self):
+        self.create(["Music"], ["Top"])  # creates the shared schedule row
+        response, few = self.create(["Music"], ["Top"])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["categories"], ["Music"])
+
+        response, many = self.create(
+            ["Music", "Art", "Kids"], ["Top", "Banner", "Push"]
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(many, few)
+        self.assertEqual(response.data["categories"], ["Music", "Art", "Kids"])
+        self.assertEqual(response.data["promotions"], ["Top", "Banner", "Push"])
+        self.assertEqual(response.data["occurrence_days"], ["понедельник", "пятница"])
+        event_id = response.data["id"]
+        self.assertEqual(EventCategory.objects.filter(event_id=event_id).count(), 3)
+        self.assertEqual(EventPromotion.objects.filter(event_id=event_id).count(), 3)
+
+    def test_unknown_title(self):
+        response, _ = self.create(["Music", "Opera"], ["Top"])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Opera", str(response.data))
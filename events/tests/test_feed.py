@@ -0,0 +1,93 @@
+from datetime import time, timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from events.models import (
+    Category,
+    EventCategory,
+    OccurrenceDays,
+    RegularEvent,
+)
+from utils.testing import create_event, create_organization
+
+
+class EventFeedTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = create_organization()
+        cls.category = Category.objects.create(title="Music")
+        cls.days = OccurrenceDays.objects.create(
+            **{day: True for day in ("monday", "wednesday", "friday")}
+        )
+
+    def create_onetime(self, title, starts_in):
+        event = create_event(self.organization, title, timezone.now() + starts_in)
+        EventCategory.objects.create(event=event, category=self.category)
+        return event
+
+    def create_regular(self, title):
+        event = RegularEvent.objects.create(
+            title=title,
+            description="",
+            organization=self.organization,
+            location="Bishkek",
+            occurrence_days=self.days,
+            start_time=time(0, 0),
+            end_time=time(23, 59),
+        )
+        EventCategory.objects.create(event=event, category=self.category)
+        return event
+
+    def get(self, **params):
+        response = self.client.get(reverse("events"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data["results"]
+
+    def test_mixed_feed_sorted_by_next_occurrence(self):
+        past = self.create_onetime("Past", -timedelta(days=3))
+        later = self.create_onetime("Later", timedelta(days=10))
+        regular = self.create_regular("Regular")
+
+        results = self.get()
+        self.assertEqual(
+            [(item["id"], item["event_type"]) for item in results],
+            [(regular.id, "regular"), (later.id, "onetime")],
+        )
+        self.assertEqual(results[1]["start_time"], int(later.start_time.timestamp()))
+
+        # Finished events are left to date filters and the other orderings.
+        results = self.get(ordering="recent")
+        self.assertEqual(
+            [item["id"] for item in results], [regular.id, later.id, past.id]
+        )
+        self.assertIsNone(results[2]["next_occurrence"])
+        results = self.get(**{"from": int(past.start_time.timestamp())})
+        self.assertEqual(
+            [item["id"] for item in results], [regular.id, later.id, past.id]
+        )
+
+    def test_filters_are_shared_with_typed_feeds(self):
+        self.create_onetime("Concert", timedelta(days=1))
+        regular = self.create_regular("Weekly concert")
+        self.create_regular("Yoga")
+
+        results = self.get(keyword="concert", event_type="regular")
+        self.assertEqual([item["id"] for item in results], [regular.id])
+
+    def test_fixed_number_of_queries(self):
+        for i in range(2):
+            self.create_onetime(f"Event {i}", timedelta(days=i))
+            self.create_regular(f"Regular {i}")
+        with CaptureQueriesContext(connection) as few:
+            self.get()
+
+        for i in range(10):
+            self.create_onetime(f"More {i}", timedelta(days=i))
+            self.create_regular(f"More regular {i}")
+        with CaptureQueriesContext(connection) as many:
+            self.assertEqual(len(self.get()), 24)
+        self.assertEqual(len(many), len(few))
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.serializers import ValidationError
+
+from events.models import Category, Event, EventCategory, RegularEvent
+from utils.db.filters import EventFilter
+from utils.testing import create_event, create_organization
+
+
+class EventFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organization = create_organization()
+        cls.charity = Category.objects.create(title="Charity")
+        cls.now = timezone.now()
+
+        cls.concert = create_event(organization, "Jazz concert", cls.now)
+        cls.lecture = create_event(
+            organization, "Charity lecture", cls.now + timedelta(days=3)
+        )
+        cls.yoga = RegularEvent.objects.create(
+            title="Morning yoga",
+            description="",
+            organization=organization,
+            location="Bishkek",
+            start_time="08:00",
+            end_time="09:00",
+        )
+        EventCategory.objects.create(event=cls.lecture, category=cls.charity)
+        EventCategory.objects.create(event=cls.yoga, category=cls.charity)
+
+    def test_keyword(self):
+        events = EventFilter().keyword("jazz").queryset()
+        self.assertEqual(list(events), [self.concert])
+
+    def test_category(self):
+        events = EventFilter().category(str(self.charity.id)).queryset()
+        self.assertEqual(list(events), [self.lecture])
+
+        events = EventFilter(RegularEvent).category(self.charity.id).queryset()
+        self.assertEqual(list(events), [self.yoga])
+
+    def test_start_date(self):
+        start_time = int(self.lecture.start_time.timestamp())
+        events = EventFilter().start_date(start_time).queryset()
+        self.assertEqual(list(events), [self.lecture])
+
+    def test_ordering(self):
+        events = EventFilter().queryset(ordering=("-start_time",))
+        self.assertEqual(list(events), [self.lecture, self.concert])
+
+    def test_event_type(self):
+        events = EventFilter(Event).event_type("regular").queryset()
+        self.assertEqual([event.id for event in events], [self.yoga.id])
+
+    def test_single_statement(self):
+        events = (
+            EventFilter()
+            .category(self.charity.id)
+            .keyword("lecture")
+            .start_date(int(self.lecture.start_time.timestamp()))
+            .queryset()
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(list(events), [self.lecture])
+
+    def test_invalid_category(self):
+        with self.assertRaises(ValidationError):
+            EventFilter().category("charity")
+
+
+class EventDateFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organization = create_organization()
+        bishkek = timezone.get_fixed_timezone(6 * 60)
+        # Wednesday, 12:00 in Bishkek.
+        cls.now = datetime(2023, 5, 10, 12, 0, tzinfo=bishkek)
+        cls.events = {}
+        for name, start in (
+            # 23:30 UTC on Tuesday is already Wednesday in Bishkek.
+            ("early_today", datetime(2023, 5, 9, 23, 30, tzinfo=dt_timezone.utc)),
+            ("tonight", datetime(2023, 5, 10, 20, 0, tzinfo=bishkek)),
+            ("friday", datetime(2023, 5, 12, 19, 0, tzinfo=bishkek)),
+            ("saturday", datetime(2023, 5, 13, 19, 0, tzinfo=bishkek)),
+            ("next_week", datetime(2023, 5, 15, 10, 0, tzinfo=bishkek)),
+        ):
+            cls.events[name] = create_event(organization, name, start)
+
+    def titles(self, **params):
+        events = (
+            EventFilter(now=self.now)
+            .from_query_params(params)
+            .queryset(ordering=("start_time",))
+        )
+        return [event.title for event in events]
+
+    def test_today_uses_local_day(self):
+        self.assertEqual(self.titles(when="today"), ["early_today", "tonight"])
+
+    def test_weekend_and_week(self):
+        self.assertEqual(self.titles(when="weekend"), ["saturday"])
+        self.assertEqual(
+            self.titles(when="week"), ["early_today", "tonight", "friday", "saturday"]
+        )
+
+    def test_start_time_day(self):
+        start_time = int(self.events["tonight"].start_time.timestamp())
+        self.assertEqual(self.titles(start_time=start_time), ["early_today", "tonight"])
+
+    def test_range_and_upcoming(self):
+        friday = int(self.events["friday"].start_time.timestamp())
+        next_week = int(self.events["next_week"].start_time.timestamp())
+        self.assertEqual(
+            self.titles(**{"from": friday, "to": next_week}), ["friday", "saturday"]
+        )
+        self.assertEqual(
+            self.titles(upcoming="true"), ["tonight", "friday", "saturday", "next_week"]
+        )
+
+    def test_invalid_shortcut(self):
+        with self.assertRaises(ValidationError):
+            self.titles(when="tomorrow")
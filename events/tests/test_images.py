@@ -0,0 +1,145 @@
+import time
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from PIL import Image, ImageOps
+from rest_framework.test import APITestCase
+
+from events.models import EventImage
+from utils.testing import (
+    MODERATED,
+    TemporaryMediaMixin,
+    create_event,
+    create_organization,
+)
+
+
+def upload(name, size=(2000, 1000)):
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, "JPEG", exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+class ImageVariantsTests(TemporaryMediaMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = create_organization()
+        cls.event = create_event(
+            cls.organization, duration=timedelta(hours=1), moderation_status=MODERATED
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def process(self):
+        call_command("process_images", stdout=StringIO())
+
+    def test_variants_are_resized_and_stripped(self):
+        image = EventImage.objects.create(event=self.event, image=upload("a.jpg"))
+        self.assertEqual(image.image_variants, {})
+        self.process()
+
+        image.refresh_from_db()
+        variants = image.image_variants
+        self.assertEqual((variants["width"], variants["height"]), (2000, 1000))
+        self.assertEqual(
+            (variants["thumbnail"]["width"], variants["thumbnail"]["height"]),
+            (320, 160),
+        )
+        for extension in ("webp", "jpeg"):
+            with image.image.storage.open(variants["medium"][extension]) as file:
+                resized = Image.open(file)
+                self.assertEqual(resized.size, (1024, 512))
+                self.assertFalse(resized.getexif())
+
+        url = reverse("onetime-events-detail", kwargs={"pk": self.event.pk})
+        (serialized,) = self.client.get(url).data["images"]
+        self.assertTrue(serialized["variants"]["thumbnail"]["webp"].endswith(".webp"))
+
+    def test_replaced_avatar_is_processed_again(self):
+        self.organization.avatar = upload("logo.jpg", size=(100, 100))
+        self.organization.save()
+        self.process()
+        self.organization.refresh_from_db()
+        self.assertEqual(self.organization.avatar_variants["width"], 100)
+
+        self.organization.name = "Renamed"
+        self.organization.save()
+        self.organization.refresh_from_db()
+        self.assertEqual(self.organization.avatar_variants["width"], 100)
+
+        self.organization.avatar = upload("logo.jpg", size=(50, 50))
+        self.organization.save()
+        self.organization.refresh_from_db()
+        self.assertEqual(self.organization.avatar_variants, {})
+        url = reverse("organization-profile", kwargs={"pk": self.organization.pk})
+        self.assertIsNone(self.client.get(url).data["avatar_variants"])
+
+        self.process()
+        self.organization.refresh_from_db()
+        self.assertEqual(self.organization.avatar_variants["width"], 50)
+
+    def test_broken_upload_is_not_retried(self):
+        broken = SimpleUploadedFile("broken.jpg", b"not an image")
+        image = EventImage.objects.create(event=self.event, image=broken)
+        self.process()
+        image.refresh_from_db()
+        self.assertIn("error", image.image_variants)
+
+    def test_failures_do_not_hold_up_the_batch(self):
+        bomb = EventImage.objects.create(event=self.event, image=upload("bomb.jpg"))
+        broken = EventImage.objects.create(
+            event=self.event, image=upload("b.jpg", size=(400, 300))
+        )
+        image = EventImage.objects.create(
+            event=self.event, image=upload("c.jpg", size=(300, 200))
+        )
+        exif_transpose = ImageOps.exif_transpose
+
+        def transpose(picture):
+            if picture.size == (400, 300):
+                raise ValueError("corrupt data")
+            return exif_transpose(picture)
+
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 100_000), mock.patch(
+            "utils.images.ImageOps.exif_transpose", transpose
+        ):
+            self.process()
+
+        for failed, error in ((bomb, "decompression bomb"), (broken, "corrupt")):
+            failed.refresh_from_db()
+            self.assertIn(error, failed.image_variants["error"])
+        image.refresh_from_db()
+        self.assertEqual(image.image_variants["width"], 300)
+
+    def test_abandoned_claims_are_processed_again(self):
+        image = EventImage.objects.create(event=self.event, image=upload("a.jpg"))
+        claimed = EventImage.objects.create(event=self.event, image=upload("b.jpg"))
+        EventImage.objects.filter(pk=image.pk).update(
+            image_variants={"processing": 0, "claim": "dead worker"}
+        )
+        running = {"processing": int(time.time()), "claim": "running worker"}
+        EventImage.objects.filter(pk=claimed.pk).update(image_variants=running)
+        self.process()
+
+        image.refresh_from_db()
+        self.assertEqual(image.image_variants["width"], 2000)
+        claimed.refresh_from_db()
+        self.assertEqual(claimed.image_variants, running)
+
+    def test_cached_listings_show_new_variants(self):
+        EventImage.objects.create(event=self.event, image=upload("a.jpg"))
+        url = reverse("onetime-events")
+        ((serialized,),) = [e["images"] for e in self.client.get(url).data["results"]]
+        self.assertIsNone(serialized["variants"])
+
+        self.process()
+        ((serialized,),) = [e["images"] for e in self.client.get(url).data["results"]]
+        self.assertEqual(serialized["variants"]["width"], 2000)
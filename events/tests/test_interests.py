@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from events.models import EventInterest
+from users.models import CustomUser
+from utils.testing import create_event, create_organization
+
+
+class EventInterestTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organization = create_organization()
+        now = timezone.now()
+        cls.popular, cls.quiet = [
+            create_event(organization, title, now + timedelta(days=days))
+            for days, title in ((1, "Popular"), (0, "Quiet"))
+        ]
+        cls.fans = [
+            CustomUser.objects.create(email=f"fan{i}@test.com", password="foo")
+            for i in range(5)
+        ]
+        for fan in cls.fans:
+            EventInterest.objects.create(user=fan, event=cls.popular)
+
+    def test_list_carries_counts_not_users(self):
+        response = self.client.get(reverse("onetime-events"))
+        popular, quiet = response.data["results"]
+        self.assertNotIn("interested", popular)
+        self.assertEqual(popular["interested_count"], 5)
+        self.assertEqual(quiet["interested_count"], 0)
+        self.assertFalse(popular["is_interested"])
+
+    def test_is_interested_for_current_user(self):
+        self.client.force_authenticate(self.fans[0])
+        response = self.client.get(reverse("onetime-events"))
+        popular, quiet = response.data["results"]
+        self.assertTrue(popular["is_interested"])
+        self.assertFalse(quiet["is_interested"])
+
+    def test_detail_carries_counts_not_users(self):
+        self.client.force_authenticate(self.fans[0])
+        for event, count, interested in (
+            (self.popular, 5, True),
+            (self.quiet, 0, False),
+        ):
+            url = reverse("onetime-events-detail", kwargs={"pk": event.pk})
+            data = self.client.get(url).data
+            self.assertNotIn("interested", data)
+            self.assertEqual(data["interested_count"], count)
+            self.assertIs(data["is_interested"], interested)
+            self.assertIn("comments_count", data)
+
+    def test_interested_endpoint_is_paginated(self):
+        url = reverse("event-interested", kwargs={"pk": self.popular.pk})
+        response = self.client.get(url, {"limit": 2})
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(
+            [item["user"] for item in response.data["results"]],
+            ["fan4@test.com", "fan3@test.com"],
+        )
+
+    def test_favourite_toggle(self):
+        user = self.fans[0]
+        self.client.force_authenticate(user)
+        url = reverse("event-add-to-favourite", kwargs={"pk": self.quiet.pk})
+        with self.assertNumQueries(2):
+            response = self.client.post(url)
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(EventInterest.objects.filter(user=user, event=self.quiet))
+
+        with self.assertNumQueries(1):
+            response = self.client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(EventInterest.objects.filter(user=user, event=self.quiet))
+
+        url = reverse("event-add-to-favourite", kwargs={"pk": 10**6})
+        self.assertEqual(self.client.post(url).status_code, 404)
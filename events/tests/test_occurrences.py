@@ -0,0 +1,97 @@
+from datetime import date, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from events.models import EventOccurrence, OccurrenceDays, RegularEvent
+from events.occurrences import expand, local_midnight, refresh_occurrences
+from utils.db.filters import EventFilter
+from utils.testing import create_event, create_organization
+
+
+@override_settings(EVENTS_OCCURRENCE_HORIZON_WEEKS=2)
+class OccurrenceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = create_organization()
+        cls.fridays = OccurrenceDays.objects.create(friday=True)
+
+    def create_regular(self, **fields):
+        fields = {"start_time": time(19), "end_time": time(21), **fields}
+        return RegularEvent.objects.create(
+            title="Quiz night",
+            description="",
+            organization=self.organization,
+            location="Bishkek",
+            occurrence_days=self.fridays,
+            **fields,
+        )
+
+    def test_expand_in_local_time(self):
+        event = self.create_regular(start_time=time(23), end_time=time(1))
+        # 2023-05-08 is a Monday.
+        occurrences = expand(event, date(2023, 5, 8), date(2023, 5, 22))
+        self.assertEqual(
+            occurrences,
+            [
+                (
+                    local_midnight(day) + timedelta(hours=23),
+                    local_midnight(day) + timedelta(hours=25),
+                )
+                for day in (date(2023, 5, 12), date(2023, 5, 19))
+            ],
+        )
+
+    def test_materialized_on_save_and_change(self):
+        event = self.create_regular()
+        self.assertEqual(EventOccurrence.objects.filter(event=event).count(), 2)
+
+        event.occurrence_days = OccurrenceDays.objects.create(
+            friday=True, saturday=True
+        )
+        event.save()
+        self.assertEqual(EventOccurrence.objects.filter(event=event).count(), 4)
+
+    def test_schedule_change_refreshes_events(self):
+        event = self.create_regular()
+        self.fridays.sunday = True
+        self.fridays.save()
+        self.assertEqual(EventOccurrence.objects.filter(event=event).count(), 4)
+
+    def test_past_occurrences_are_kept(self):
+        event = self.create_regular()
+        refresh_occurrences([event], now=timezone.now() + timedelta(weeks=1))
+        self.assertEqual(EventOccurrence.objects.filter(event=event).count(), 3)
+
+    def test_onetime_event_has_single_occurrence(self):
+        start = timezone.now()
+        event = create_event(self.organization, "Concert", start)
+        event.start_time = start + timedelta(days=1)
+        event.save()
+        self.assertEqual(
+            list(
+                EventOccurrence.objects.filter(event=event).values_list(
+                    "start_time", flat=True
+                )
+            ),
+            [event.start_time],
+        )
+
+    def test_regular_feed_filters_by_occurrence(self):
+        event = self.create_regular()
+        friday = EventOccurrence.objects.filter(event=event).earliest("start_time")
+        day = int(friday.start_time.timestamp())
+        self.assertEqual(
+            list(EventFilter(RegularEvent).start_date(day).queryset()), [event]
+        )
+        self.assertEqual(
+            list(EventFilter(RegularEvent).start_date(day - 86400).queryset()), []
+        )
+
+    def test_refresh_command(self):
+        event = self.create_regular()
+        EventOccurrence.objects.all().delete()
+        call_command("refresh_occurrences", stdout=StringIO())
+        self.assertEqual(EventOccurrence.objects.filter(event=event).count(), 2)
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from events.models import OneTimeEvent
+from users.models import Organization
+from utils.testing import create_event, create_organization
+
+
+class KeysetPaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        organization = create_organization()
+        now = timezone.now()
+        # Several events share a start time to make sure ties are not skipped.
+        for i in range(7):
+            create_event(organization, f"Event {i}", now + timedelta(days=i // 3))
+        cls.expected = list(
+            OneTimeEvent.objects.order_by("-start_time", "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def test_walks_all_pages_forward_and_back(self):
+        url = reverse("onetime-events") + "?page_size=3"
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            pages.append(response.data)
+            url = response.data["next"]
+
+        ids = [event["id"] for page in pages for event in page["results"]]
+        self.assertEqual(ids, self.expected)
+        self.assertIsNone(pages[0]["previous"])
+
+        response = self.client.get(pages[-1]["previous"])
+        self.assertEqual(response.data["results"], pages[-2]["results"])
+
+    def test_no_count_query(self):
+        url = reverse("onetime-events") + "?cursor="
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 7)
+        for query in context.captured_queries:
+            self.assertFalse(query["sql"].startswith("SELECT COUNT(*)"))
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(reverse("onetime-events") + "?page_size=100000")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(reverse("onetime-events") + "?limit=100000")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("onetime-events") + "?cursor=garbage")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_keyword_search_keeps_relevance_order(self):
+        organization = Organization.objects.get()
+        now = timezone.now()
+        for title, days in (("Jazz night", 1), ("Jazz jazz jazz festival", 10)):
+            OneTimeEvent.objects.create(
+                title=title,
+                description="",
+                organization=organization,
+                location="Bishkek",
+                start_time=now + timedelta(days=days),
+                end_time=now + timedelta(days=days, hours=2),
+            )
+        url = reverse("onetime-events")
+        for params in (
+            {"keyword": "jazz", "cursor": ""},
+            {"keyword": "jazz", "page_size": 2},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url, {"keyword": "jazz", "limit": 2})
+        titles = [event["title"] for event in response.data["results"]]
+        self.assertEqual(titles, ["Jazz jazz jazz festival", "Jazz night"])
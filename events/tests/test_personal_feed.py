@@ -0,0 +1,82 @@
+from datetime import time, timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from events.models import (
+    Category,
+    EventCategory,
+    OccurrenceDays,
+    RegularEvent,
+)
+from users.models import CustomUser, Customer
+from utils.testing import MODERATED, create_event, create_organization
+
+
+class PersonalFeedTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = create_organization()
+        cls.music, cls.art, cls.sport = [
+            Category.objects.create(title=title) for title in ("Music", "Art", "Sport")
+        ]
+        user = CustomUser.objects.create(email="fan@test.com", password="foo")
+        cls.customer = Customer.objects.create(
+            user=user, username="fan", interests_ids=[cls.music.pk, cls.art.pk]
+        )
+        days = OccurrenceDays.objects.create(monday=True, thursday=True)
+
+        cls.both = cls.create_onetime("Both", timedelta(days=3), cls.music, cls.art)
+        cls.soon = cls.create_onetime("Soon", timedelta(days=1), cls.music)
+        cls.regular = RegularEvent.objects.create(
+            title="Regular",
+            description="",
+            organization=cls.organization,
+            location="Bishkek",
+            occurrence_days=days,
+            start_time=time(0, 0),
+            end_time=time(23, 59),
+            moderation_status=MODERATED,
+        )
+        EventCategory.objects.create(event=cls.regular, category=cls.art)
+        # Filtered out: past, not moderated, outside the interests.
+        cls.create_onetime("Past", timedelta(days=-1), cls.music)
+        cls.create_onetime("Pending", timedelta(days=1), cls.music, moderated=False)
+        cls.create_onetime("Sport", timedelta(days=1), cls.sport)
+
+    @classmethod
+    def create_onetime(cls, title, starts_in, *categories, moderated=True):
+        event = create_event(
+            cls.organization,
+            title,
+            timezone.now() + starts_in,
+            moderation_status=MODERATED if moderated else "на модерации",
+        )
+        for category in categories:
+            EventCategory.objects.create(event=event, category=category)
+        return event
+
+    def test_ranks_by_matching_interests_then_date(self):
+        self.client.force_authenticate(self.customer.user)
+        response = self.client.get(reverse("events-for-you"))
+        self.assertEqual(response.status_code, 200)
+        titles = [event["title"] for event in response.data["results"]]
+        self.assertEqual(titles[0], "Both")
+        self.assertEqual(sorted(titles[1:]), ["Regular", "Soon"])
+        types = {
+            event["title"]: event["event_type"] for event in response.data["results"]
+        }
+        self.assertEqual(types["Regular"], "regular")
+
+    def test_customer_without_interests(self):
+        self.customer.interests_ids = None
+        self.customer.save()
+        self.client.force_authenticate(self.customer.user)
+        response = self.client.get(reverse("events-for-you"))
+        self.assertEqual(response.data["results"], [])
+
+    def test_requires_customer(self):
+        self.client.force_authenticate(self.organization.user)
+        response = self.client.get(reverse("events-for-you"))
+        self.assertEqual(response.status_code, 403)
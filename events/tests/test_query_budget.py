@@ -0,0 +1,507 @@
+import asyncio
+import logging
+import time as clock
+from datetime import time, timedelta
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from events import urls as event_urls
+from events.models import (
+    Category,
+    EventCategory,
+    EventComment,
+    EventImage,
+    EventInterest,
+    EventPromotion,
+    OccurrenceDays,
+    OneTimeEvent,
+    PromotionType,
+    RegularEvent,
+    TimelineEntry,
+)
+from users import urls as user_urls
+from users.models import CustomUser, Customer, Following, Organization
+from utils.db.debug import RepeatedQueryMiddleware, query_shape
+from utils.testing import MODERATED, TemporaryMediaMixin, create_organization
+
+PASSWORD = "Budget-password-1"
+
+
+class QueryBudgetTests(TemporaryMediaMixin, APITestCase):
+    """
+    The number of queries of every endpoint must not depend on the number of
+    items it handles.
+
+    Each route of ``events.urls`` and ``users.urls`` has a scenario seeding
+    ``count`` items (the rows of the page, the related rows of the object or
+    the ids of the request) and returning the request to measure. It runs
+    with 1 and with 50 items, each in a transaction rolled back afterwards,
+    and both must run the same number of queries.
+    """
+
+    counts = (1, 50)
+    media_settings = {"UPLOADS_BACKEND": "utils.uploads.LocalUploadBackend"}
+
+    @classmethod
+    def setUpTestData(cls):
+        count = max(cls.counts)
+        cls.categories = Category.objects.bulk_create(
+            Category(title=f"Category {i}") for i in range(count)
+        )
+        cls.promotions = PromotionType.objects.bulk_create(
+            PromotionType(title=f"Promotion {i}", price=100) for i in range(count)
+        )
+        cls.days = OccurrenceDays.objects.create(monday=True, friday=True)
+
+        cls.organization = create_organization()
+        user = CustomUser.objects.create_user(
+            email="fan@test.com", password=PASSWORD, is_active=True
+        )
+        cls.customer = Customer.objects.create(
+            user=user, username="fan", interests_ids=[cls.categories[0].pk]
+        )
+
+        cls.people = CustomUser.objects.bulk_create(
+            CustomUser(email=f"user{i}@test.com", password="foo") for i in range(count)
+        )
+        Customer.objects.bulk_create(
+            Customer(user=user, username=f"user{i}")
+            for i, user in enumerate(cls.people)
+        )
+
+    def scenarios(self):
+        """Scenario of each route, keyed by its pattern."""
+        return {
+            # events.urls
+            "events/": self.feed,
+            "events/for-you/": self.personal_feed,
+            "events/timeline/": self.timeline,
+            "events/onetime/": self.onetime_list,
+            "events/onetime/<int:pk>": self.onetime_detail,
+            "events/regular/": self.regular_list,
+            "events/regular/<int:pk>": self.regular_detail,
+            "events/categories/": self.categories_list,
+            "events/<int:pk>/comments/": self.comments,
+            "events/<int:pk>/comment/": self.comment_create,
+            "organization/<int:pk>/events/uploads/": self.upload_issue,
+            "uploads/<str:token>/": self.upload,
+            "organization/<int:pk>/events/onetime/create/": self.onetime_create,
+            "organization/<int:pk>/events/regular/create/": self.regular_create,
+            "events/<int:pk>/interested/": self.interested,
+            "events/<int:pk>/add-to-favourite/": self.favourite,
+            # users.urls
+            "users/signup/customer/": self.customer_signup,
+            "users/create/organization/": self.organization_signup,
+            "users/password_reset/": self.password_reset,
+            "users/password_reset/confirm/<uidb64>/<token>/": self.password_reset_confirm,
+            "users/login/": self.login,
+            "users/login/refresh/": self.login_refresh,
+            "profile/customer/<int:pk>/": self.customer_profile,
+            "profile/customer/<int:pk>/organizations/": self.customer_organizations,
+            "profile/organization/<int:pk>/": self.organization_detail,
+            "profile/organization/<int:pk>/events/": self.organization_events,
+            "accounts/organizations/": self.organization_list,
+            "accounts/organization/<int:pk>/follow/": self.organization_follow,
+            "accounts/users/": self.customer_list,
+            "accounts/customer/<int:pk>/follow/": self.customer_follow,
+            "accounts/following/state/": self.following_state,
+        }
+
+    def test_every_route_has_a_scenario(self):
+        routes = {
+            str(pattern.pattern)
+            for pattern in event_urls.urlpatterns + user_urls.urlpatterns
+        }
+        self.assertEqual(routes, set(self.scenarios()))
+
+    def test_queries_do_not_grow_with_items(self):
+        for route, scenario in self.scenarios().items():
+            with self.subTest(route=route):
+                queries = [self.count_queries(scenario, count) for count in self.counts]
+                self.assertEqual(queries[-1], queries[0], f"{route}: {queries} queries")
+
+    def count_queries(self, scenario, count):
+        with transaction.atomic():
+            request = scenario(count)
+            cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                response = request()
+            self.assertLess(response.status_code, 400, response.content)
+            transaction.set_rollback(True)
+        self.client.force_authenticate(None)
+        return len(context)
+
+    def get(self, url, user=None, **params):
+        self.client.force_authenticate(user)
+        return lambda: self.client.get(url, params)
+
+    def post(self, url, data=None, user=None):
+        self.client.force_authenticate(user)
+        return lambda: self.client.post(url, data or {}, format="json")
+
+    # Fixtures
+
+    def make_events(self, count, model=OneTimeEvent, organization=None):
+        """Moderated events with a category, promotion, image, interest and comment."""
+        now = timezone.now()
+        events = []
+        for i in range(count):
+            if model is OneTimeEvent:
+                start = now + timedelta(days=1, hours=i)
+                times = dict(start_time=start, end_time=start + timedelta(hours=2))
+            else:
+                times = dict(
+                    occurrence_days=self.days, start_time=time(10), end_time=time(12)
+                )
+            events.append(
+                model.objects.create(
+                    title=f"Event {i}",
+                    description="",
+                    organization=organization or self.organization,
+                    location="Bishkek",
+                    moderation_status=MODERATED,
+                    **times,
+                )
+            )
+        user = self.customer.user
+        EventCategory.objects.bulk_create(
+            EventCategory(event=event, category=self.categories[0]) for event in events
+        )
+        EventPromotion.objects.bulk_create(
+            EventPromotion(event=event, promotion=self.promotions[0])
+            for event in events
+        )
+        EventImage.objects.bulk_create(
+            EventImage(event=event, image=f"images/{event.pk}.jpg") for event in events
+        )
+        EventInterest.objects.bulk_create(
+            EventInterest(user=user, event=event) for event in events
+        )
+        EventComment.objects.bulk_create(
+            EventComment(user=user, event=event, text="Nice") for event in events
+        )
+        return events
+
+    def make_mixed_events(self, count, organization=None):
+        """``count`` events of each type, interleaved so any page holds both."""
+        events = []
+        for _ in range(count):
+            for model in (OneTimeEvent, RegularEvent):
+                events += self.make_events(1, model, organization)
+        return events
+
+    def make_event(self, count, model=OneTimeEvent):
+        """One event with ``count`` of each of its related rows."""
+        (event,) = self.make_events(1, model)
+        people = self.people[: count - 1]
+        EventCategory.objects.bulk_create(
+            EventCategory(event=event, category=category)
+            for category in self.categories[1:count]
+        )
+        EventPromotion.objects.bulk_create(
+            EventPromotion(event=event, promotion=promotion)
+            for promotion in self.promotions[1:count]
+        )
+        EventImage.objects.bulk_create(
+            EventImage(event=event, image=f"images/{event.pk}-{i}.jpg")
+            for i in range(1, count)
+        )
+        EventInterest.objects.bulk_create(
+            EventInterest(user=user, event=event) for user in people
+        )
+        EventComment.objects.bulk_create(
+            EventComment(user=user, event=event, text="Nice") for user in people
+        )
+        return event
+
+    def make_organizations(self, count, user=None):
+        if user is None:
+            users = CustomUser.objects.bulk_create(
+                CustomUser(email=f"owner{i}@test.com", password="foo")
+                for i in range(count)
+            )
+        else:
+            users = [user] * count
+        return Organization.objects.bulk_create(
+            Organization(user=user, name=f"Club {i}", description="", type="Club")
+            for i, user in enumerate(users)
+        )
+
+    def event_data(self, count):
+        now = int(clock.time())
+        return {
+            "title": "Event",
+            "description": "Budget",
+            "location": "Bishkek",
+            "categories": [",".join(c.title for c in self.categories[:count])],
+            "promotions": [",".join(p.title for p in self.promotions[:count])],
+            "start_time": now + 3600,
+            "end_time": now + 7200,
+        }
+
+    # events.urls
+
+    def feed(self, count):
+        self.make_mixed_events(count)
+        return self.get("/events/", limit=2 * count)
+
+    def personal_feed(self, count):
+        self.make_mixed_events(count)
+        return self.get("/events/for-you/", self.customer.user, limit=2 * count)
+
+    def timeline(self, count):
+        user = self.customer.user
+        TimelineEntry.objects.bulk_create(
+            TimelineEntry(user=user, event=event)
+            for event in self.make_mixed_events(count)
+        )
+        return self.get("/events/timeline/", user, limit=2 * count)
+
+    def onetime_list(self, count):
+        self.make_events(count)
+        return self.get("/events/onetime/", self.customer.user, limit=count)
+
+    def onetime_detail(self, count):
+        event = self.make_event(count)
+        return self.get(f"/events/onetime/{event.pk}", self.customer.user)
+
+    def regular_list(self, count):
+        self.make_events(count, RegularEvent)
+        return self.get("/events/regular/", self.customer.user, limit=count)
+
+    def regular_detail(self, count):
+        event = self.make_event(count, RegularEvent)
+        return self.get(f"/events/regular/{event.pk}", self.customer.user)
+
+    def categories_list(self, count):
+        Category.objects.bulk_create(
+            Category(title=f"New category {i}") for i in range(count)
+        )
+        return self.get("/events/categories/")
+
+    def comments(self, count):
+        event = self.make_event(count)
+        return self.get(f"/events/{event.pk}/comments/", page_size=count)
+
+    def comment_create(self, count):
+        event = self.make_event(count)
+        return self.post(
+            f"/events/{event.pk}/comment/", {"text": "Hi"}, self.customer.user
+        )
+
+    def upload_issue(self, count):
+        self.make_events(count)
+        return self.post(
+            f"/organization/{self.organization.pk}/events/uploads/",
+            {"content_type": "image/png", "size": 100},
+            self.organization.user,
+        )
+
+    def upload(self, count):
+        upload = self.upload_issue(count)().data
+        self.client.force_authenticate(None)
+        return lambda: self.client.put(
+            upload["url"], b"png bytes", content_type="image/png"
+        )
+
+    def onetime_create(self, count):
+        return self.post(
+            f"/organization/{self.organization.pk}/events/onetime/create/",
+            self.event_data(count),
+            self.organization.user,
+        )
+
+    def regular_create(self, count):
+        data = self.event_data(count)
+        data.update(
+            start_time="10:00", end_time="12:00", occurrence_days=["monday,friday"]
+        )
+        return self.post(
+            f"/organization/{self.organization.pk}/events/regular/create/",
+            data,
+            self.organization.user,
+        )
+
+    def interested(self, count):
+        event = self.make_event(count)
+        return self.get(f"/events/{event.pk}/interested/", limit=count)
+
+    def favourite(self, count):
+        event = self.make_event(count)
+        return self.post(f"/events/{event.pk}/add-to-favourite/", user=self.people[-1])
+
+    # users.urls
+
+    def customer_signup(self, count):
+        data = {
+            "username": "newcomer",
+            "email": "newcomer@test.com",
+            "password": PASSWORD,
+            "password2": PASSWORD,
+        }
+        return self.post("/users/signup/customer/", data)
+
+    def organization_signup(self, count):
+        user = self.people[0]
+        self.make_organizations(count, user)
+        data = {
+            "name": "New Club",
+            "description": "Budget",
+            "type": "Club",
+            "phone_number": None,
+            "address": None,
+            "insta_link": None,
+        }
+        return self.post("/users/create/organization/", data, user)
+
+    def password_reset(self, count):
+        return self.post("/users/password_reset/", {"email": self.customer.user.email})
+
+    def password_reset_confirm(self, count):
+        user = self.customer.user
+        uidb64 = urlsafe_base64_encode(force_bytes(user.pk))
+        token = default_token_generator.make_token(user)
+        data = {"new_password1": PASSWORD + "!", "new_password2": PASSWORD + "!"}
+        return self.post(f"/users/password_reset/confirm/{uidb64}/{token}/", data)
+
+    def login(self, count):
+        data = {"username": self.customer.username, "password": PASSWORD}
+        return self.post("/users/login/", data)
+
+    def login_refresh(self, count):
+        refresh = RefreshToken.for_user(self.customer.user)
+        return self.post("/users/login/refresh/", {"refresh": str(refresh)})
+
+    def customer_profile(self, count):
+        user = self.customer.user
+        Following.objects.bulk_create(
+            Following(follower=follower, following=user)
+            for follower in self.people[:count]
+        )
+        return self.get(f"/profile/customer/{user.pk}/")
+
+    def customer_organizations(self, count):
+        user = self.people[0]
+        self.make_organizations(count, user)
+        return self.get(f"/profile/customer/{user.pk}/organizations/", user)
+
+    def organization_detail(self, count):
+        self.make_mixed_events(count)
+        return self.get(
+            f"/profile/organization/{self.organization.pk}/", self.customer.user
+        )
+
+    def organization_events(self, count):
+        self.make_mixed_events(count)
+        return self.get(
+            f"/profile/organization/{self.organization.pk}/events/",
+            self.customer.user,
+            limit=2 * count,
+        )
+
+    def organization_list(self, count):
+        self.make_organizations(count)
+        return self.get("/accounts/organizations/", limit=count)
+
+    def organization_follow(self, count):
+        (organization,) = self.make_organizations(1)
+        self.make_mixed_events(count, organization)
+        return self.post(
+            f"/accounts/organization/{organization.pk}/follow/",
+            user=self.customer.user,
+        )
+
+    def customer_list(self, count):
+        return self.get("/accounts/users/", limit=count)
+
+    def customer_follow(self, count):
+        target = self.people[-1]
+        Following.objects.bulk_create(
+            Following(follower=follower, following=target)
+            for follower in self.people[: count - 1]
+        )
+        return self.post(
+            f"/accounts/customer/{target.pk}/follow/", user=self.customer.user
+        )
+
+    def following_state(self, count):
+        events = self.make_events(count)
+        return self.get(
+            "/accounts/following/state/",
+            self.customer.user,
+            events=[event.pk for event in events],
+            organizations=[
+                organization.pk for organization in self.make_organizations(count)
+            ],
+            customers=[user.pk for user in self.people[:count]],
+        )
+
+
+@override_settings(REPEATED_QUERY_THRESHOLD=3)
+class RepeatedQueryMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories = Category.objects.bulk_create(
+            Category(title=f"Category {i}") for i in range(3)
+        )
+
+    def request(self, view):
+        middleware = RepeatedQueryMiddleware(lambda request: view())
+        return middleware(self.client.request().wsgi_request)
+
+    def test_logs_repeated_shapes(self):
+        def view():
+            for category in self.categories:
+                Category.objects.get(pk=category.pk)
+
+        with self.assertLogs("utils.db.debug", logging.WARNING) as logs:
+            self.request(view)
+        (message,) = logs.output
+        self.assertIn("ran the same query 3 times", message)
+        self.assertIn('FROM "events_category"', message)
+
+    def test_batched_queries_are_quiet(self):
+        def view():
+            list(Category.objects.filter(pk__in=[c.pk for c in self.categories]))
+            list(Category.objects.filter(pk__in=[self.categories[0].pk]))
+            list(Category.objects.all())
+
+        with mock.patch("utils.db.debug.logger") as logger:
+            self.request(view)
+        logger.warning.assert_not_called()
+
+    def test_counts_the_queries_of_async_requests(self):
+        @sync_to_async
+        def view():
+            for category in self.categories:
+                Category.objects.get(pk=category.pk)
+
+        async def get_response(request):
+            await view()
+            return HttpResponse()
+
+        middleware = RepeatedQueryMiddleware(get_response)
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        request = AsyncRequestFactory().get("/")
+        with self.assertLogs("utils.db.debug", logging.WARNING) as logs:
+            async_to_sync(middleware)(request)
+        (message,) = logs.output
+        self.assertIn("ran the same query 3 times", message)
+
+    def test_in_lists_share_a_shape(self):
+        self.assertEqual(
+            query_shape("SELECT 1 WHERE id IN (%s, %s, %s) AND x = %s"),
+            query_shape("SELECT 1 WHERE id IN (%s) AND x = %s"),
+        )
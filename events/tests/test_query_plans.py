@@ -0,0 +1,300 @@
+from datetime import time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from events.models import (
+    Category,
+    Event,
+    EventCategory,
+    EventComment,
+    EventImage,
+    EventInterest,
+    OccurrenceDays,
+    OneTimeEvent,
+    RegularEvent,
+    TimelineEntry,
+)
+from events.search import update_search_vector
+from users.mail import deliver_pending, queue_email
+from users.models import (
+    CustomUser,
+    Customer,
+    FollowingOrganization,
+    Organization,
+    OutgoingEmail,
+)
+from utils.testing import MODERATED
+
+class QueryPlanTests(APITestCase):
+    """
+    Each endpoint's main query must be answered from the index meant for it.
+
+    Sequential scans are disabled while explaining, so a query that no index
+    can serve (a dropped index, a non-sargable condition) still plans a
+    ``Seq Scan`` and fails, whatever the size of the test tables.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.categories = [
+            Category.objects.create(title=f"Category {i}") for i in range(10)
+        ]
+        days = OccurrenceDays.objects.create(tuesday=True, saturday=True)
+        cls.organizations = []
+        for i in range(5):
+            user = CustomUser.objects.create(email=f"org{i}@test.com", password="foo")
+            cls.organizations.append(
+                Organization.objects.create(
+                    user=user, name=f"Organization {i}", description="", type="Club"
+                )
+            )
+
+        events = []
+        for i in range(150):
+            start = now + timedelta(days=i % 30 - 5, hours=i % 24)
+            events.append(
+                OneTimeEvent.objects.create(
+                    title="Jazz night" if i == 3 else f"Concert {i}",
+                    description="Live music in the park",
+                    organization=cls.organizations[i % 5],
+                    location="Bishkek",
+                    start_time=start,
+                    end_time=start + timedelta(hours=2),
+                    moderation_status=MODERATED if i % 10 else "на модерации",
+                )
+            )
+        for i in range(100):
+            events.append(
+                RegularEvent.objects.create(
+                    title=f"Workshop {i}",
+                    description="Weekly workshop",
+                    organization=cls.organizations[i % 5],
+                    location="Bishkek",
+                    occurrence_days=days,
+                    start_time=time(10 + i % 8),
+                    end_time=time(20),
+                    moderation_status=MODERATED,
+                )
+            )
+        cls.event = events[0]
+        EventCategory.objects.bulk_create(
+            EventCategory(event=event, category=cls.categories[(i + j) % 10])
+            for i, event in enumerate(events)
+            for j in range(2)
+        )
+
+        users = CustomUser.objects.bulk_create(
+            CustomUser(email=f"user{i}@test.com", password="foo") for i in range(50)
+        )
+        users[1].verification_token = "token"
+        users[1].save()
+        cls.customer = Customer.objects.create(
+            user=users[0],
+            username="fan",
+            interests_ids=[category.pk for category in cls.categories[:2]],
+        )
+        Customer.objects.bulk_create(
+            Customer(user=user, username=f"user{i}")
+            for i, user in enumerate(users[1:10])
+        )
+        EventComment.objects.bulk_create(
+            EventComment(user=user, event=event, text="Nice")
+            for user in users[:10]
+            for event in events[:20]
+        )
+        EventInterest.objects.bulk_create(
+            EventInterest(user=user, event=event)
+            for user in users[:10]
+            for event in events[::7]
+        )
+        FollowingOrganization.objects.bulk_create(
+            FollowingOrganization(follower=user, following=organization)
+            for user in users
+            for organization in cls.organizations[:2]
+        )
+        TimelineEntry.objects.bulk_create(
+            TimelineEntry(user=user, event=event)
+            for user in users
+            for event in events[:40]
+        )
+        EventImage.objects.bulk_create(
+            EventImage(event=event, image=f"images/{event.pk}.jpg") for event in events
+        )
+        for user in users[:30]:
+            queue_email("Subject", "Body", [user.email])
+        cls.seed_events(cls.organizations[4], 3000)
+
+        with connection.cursor() as cursor:
+            # VACUUM cannot run in the test transaction; flush the GIN pending
+            # list it would have merged, the planner prices scanning it.
+            cursor.execute("SELECT gin_clean_pending_list('event_search_vector_idx')")
+            cursor.execute("ANALYZE")
+
+    @staticmethod
+    def seed_events(organization, count):
+        """
+        Bulk one-time events with their occurrence, in SQL: the ORM cannot
+        bulk create multi-table models and creating them one by one is slow.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                WITH events AS (
+                    INSERT INTO events_event (
+                        title, description, price, organization_id, location,
+                        entry, moderation_status
+                    )
+                    SELECT 'Lecture ' || n, 'Evening lecture', 0, %s, 'Bishkek',
+                        'свободный', %s
+                    FROM generate_series(1, %s) AS n
+                    RETURNING id
+                ), onetime AS (
+                    INSERT INTO events_onetimeevent (event_ptr_id, start_time, end_time)
+                    SELECT id, now() + id * interval '3 hours',
+                        now() + id * interval '3 hours' + interval '2 hours'
+                    FROM events
+                    RETURNING event_ptr_id, start_time, end_time
+                )
+                INSERT INTO events_eventoccurrence (event_id, start_time, end_time)
+                SELECT * FROM onetime
+                """,
+                [organization.pk, MODERATED, count],
+            )
+        update_search_vector(Event.objects.filter(search_vector__isnull=True))
+
+    def setUp(self):
+        cache.clear()
+
+    def explain(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}", params or None)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            cursor.execute("RESET enable_seqscan")
+        return plan
+
+    def main_query(self, table, request):
+        """The first statement ``request()`` runs against ``table``."""
+        with CaptureQueriesContext(connection) as context:
+            request()
+        for query in context.captured_queries:
+            sql = query["sql"]
+            # Pagination counts are answered by the same indexes as the page.
+            if f'FROM "{table}"' in sql and not sql.startswith("SELECT COUNT(*)"):
+                return sql
+        self.fail(f"No query on {table}")
+
+    def endpoint_query(self, table, url, user=None, **params):
+        self.client.force_authenticate(user)
+        return self.main_query(table, lambda: self.client.get(url, params))
+
+    def assertUsesIndex(self, sql, table, *indexes, params=()):
+        plan = self.explain(sql, params)
+        self.assertNotIn(f"Seq Scan on {table}", plan, plan)
+        for index in indexes:
+            self.assertIn(index, plan, plan)
+
+    def test_event_lists(self):
+        for url, table, index in (
+            ("onetime-events", "events_onetimeevent", "onetimeevent_start_idx"),
+            ("regular-events", "events_regularevent", "regularevent_start_idx"),
+        ):
+            with self.subTest(url=url):
+                sql = self.endpoint_query(table, reverse(url), page_size=20)
+                self.assertUsesIndex(sql, table, index)
+
+    def test_feed(self):
+        sql = self.endpoint_query("events_event", reverse("events"))
+        self.assertUsesIndex(sql, "events_eventoccurrence", "occurrence_end_idx")
+
+    def test_feed_filters(self):
+        url = reverse("events")
+        sql = self.endpoint_query("events_event", url, when="week")
+        self.assertUsesIndex(sql, "events_eventoccurrence", "occurrence_start_idx")
+
+        sql = self.endpoint_query("events_event", url, keyword="jazz")
+        self.assertUsesIndex(sql, "events_event", "event_search_vector_idx")
+
+    def test_personal_feed(self):
+        sql = self.endpoint_query(
+            "events_event", reverse("events-for-you"), self.customer.user
+        )
+        self.assertUsesIndex(sql, "events_eventcategory", "eventcategory_category_idx")
+
+    def test_timeline(self):
+        sql = self.endpoint_query(
+            "events_event", reverse("events-timeline"), self.customer.user
+        )
+        self.assertUsesIndex(sql, "events_timelineentry", "unique_timeline_entry")
+
+    def test_comments(self):
+        url = reverse("event-comments", kwargs={"pk": self.event.pk})
+        sql = self.endpoint_query("events_eventcomment", url)
+        self.assertUsesIndex(sql, "events_eventcomment", "comment_event_idx")
+
+    def test_organization_events(self):
+        organization = self.organizations[0]
+        url = reverse("organization-events", kwargs={"pk": organization.pk})
+        sql = self.endpoint_query("events_event", url)
+        self.assertUsesIndex(sql, "events_event", "event_organization_idx")
+
+    def test_organization_search(self):
+        url = reverse("organization-list")
+        sql = self.endpoint_query("users_organization", url, keyword="Organization")
+        # Substring matches OR trigram-similar names: one index for each side.
+        self.assertUsesIndex(
+            sql,
+            "users_organization",
+            "organization_name_itrgm_idx",
+            "organization_name_trgm_idx",
+        )
+
+    def test_following_state(self):
+        url = reverse("following-state")
+        sql = self.endpoint_query(
+            "users_followingorganization",
+            url,
+            self.customer.user,
+            organizations=[organization.pk for organization in self.organizations],
+        )
+        self.assertUsesIndex(
+            sql, "users_followingorganization", "unique_following_organization"
+        )
+
+    def test_background_and_lookup_queries(self):
+        sql = self.main_query("users_outgoingemail", lambda: deliver_pending())
+        self.assertUsesIndex(sql, "users_outgoingemail", "outgoing_email_pending_idx")
+        self.assertEqual(
+            OutgoingEmail.objects.filter(status=OutgoingEmail.SENT).count(), 30
+        )
+
+        User = get_user_model()
+        sql, params = User.objects.filter(
+            verification_token="token"
+        ).query.sql_with_params()
+        self.assertUsesIndex(
+            sql, "users_customuser", "user_verification_token_idx", params=params
+        )
+
+        sql, params = EventImage.objects.filter(
+            image__in=["images/1.jpg"]
+        ).query.sql_with_params()
+        self.assertUsesIndex(
+            sql, "events_eventimage", "unique_event_image", params=params
+        )
+
+        sql, params = (
+            OneTimeEvent.objects.filter(moderation_status="на модерации")
+            .order_by("-pk")
+            .query.sql_with_params()
+        )
+        self.assertUsesIndex(
+            sql, "events_event", "event_pending_moderation_idx", params=params
+        )
@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from events.models import OneTimeEvent
+from users.models import CustomUser
+from utils.db.routers import ReplicaRouter, replica_reads
+from utils.testing import MODERATED, create_event, create_organization
+
+
+@override_settings(REPLICA_DATABASES=["replica_0"])
+class ReplicaRouterTests(SimpleTestCase):
+    def test_reads_follow_the_request_switch(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(OneTimeEvent), "default")
+
+        token = replica_reads.set(True)
+        try:
+            self.assertEqual(router.db_for_read(OneTimeEvent), "replica_0")
+            self.assertEqual(router.db_for_write(OneTimeEvent), "default")
+            with override_settings(REPLICA_DATABASES=[]):
+                self.assertEqual(router.db_for_read(OneTimeEvent), "default")
+        finally:
+            replica_reads.reset(token)
+
+    def test_only_default_is_migrated(self):
+        router = ReplicaRouter()
+        self.assertTrue(router.allow_migrate("default", "events"))
+        self.assertFalse(router.allow_migrate("replica_0", "events"))
+
+
+class ReplicaReadViewTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(email="user@test.com", password="foo")
+        cls.other = CustomUser.objects.create(email="other@test.com", password="foo")
+        organization = create_organization(user=cls.user)
+        cls.event = create_event(
+            organization, duration=timedelta(hours=1), moderation_status=MODERATED
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def replica_flags(self, method, url, user=None):
+        """Whether each query of the request was allowed on a replica."""
+        flags = []
+
+        def record(execute, sql, params, many, context):
+            flags.append(replica_reads.get())
+            return execute(sql, params, many, context)
+
+        self.client.force_authenticate(user)
+        with connection.execute_wrapper(record):
+            response = getattr(self.client, method)(url)
+        self.assertLess(response.status_code, 400)
+        self.assertFalse(replica_reads.get())
+        return flags
+
+    def test_safe_reads_use_replicas(self):
+        for url in (
+            reverse("onetime-events"),
+            reverse("onetime-events-detail", kwargs={"pk": self.event.pk}),
+            reverse("customer-list"),
+        ):
+            with self.subTest(url=url):
+                flags = self.replica_flags("get", url)
+                self.assertTrue(flags)
+                self.assertTrue(all(flags))
+
+    def test_own_writes_pin_reads_to_primary(self):
+        url = reverse("onetime-events-detail", kwargs={"pk": self.event.pk})
+        favourite = reverse("event-add-to-favourite", kwargs={"pk": self.event.pk})
+
+        self.assertFalse(any(self.replica_flags("post", favourite, self.user)))
+        self.assertFalse(any(self.replica_flags("get", url, self.user)))
+        self.assertTrue(all(self.replica_flags("get", url, self.other)))
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from events.models import OneTimeEvent
+from users.models import CustomUser, Organization
+
+
+class EventSearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = CustomUser.objects.create(email="org@test.com", password="foo")
+        cls.organization = Organization.objects.create(
+            user=user, name="Филармония", description="", type="Музыка"
+        )
+        now = timezone.now()
+        cls.title_match = cls.create_event("Большой концерт", "Вечер музыки", now)
+        cls.description_match = cls.create_event(
+            "Вечер в парке", "После лекции будет концерт", now + timedelta(days=1)
+        )
+        cls.other = cls.create_event("Лекция", "Об истории города", now)
+
+    @classmethod
+    def create_event(cls, title, description, start_time):
+        return OneTimeEvent.objects.create(
+            title=title,
+            description=description,
+            organization=cls.organization,
+            location="Бишкек",
+            start_time=start_time,
+            end_time=start_time + timedelta(hours=2),
+        )
+
+    def search(self, keyword):
+        response = self.client.get(reverse("onetime-events"), {"keyword": keyword})
+        return [event["id"] for event in response.data["results"]]
+
+    def test_matches_word_forms_ranked_by_field_weight(self):
+        self.assertEqual(
+            self.search("концерты"), [self.title_match.id, self.description_match.id]
+        )
+
+    def test_matches_organization_name(self):
+        self.assertEqual(len(self.search("филармонии")), 3)
+
+    def test_vector_follows_updates(self):
+        self.other.title = "Концерт органной музыки"
+        self.other.save()
+        self.assertIn(self.other.id, self.search("концерт"))
+
+        self.organization.name = "Театр"
+        self.organization.save()
+        self.assertEqual(self.search("филармония"), [])
+        self.assertEqual(len(self.search("театр")), 3)
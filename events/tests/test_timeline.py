@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from events.models import TimelineEntry
+from users.models import CustomUser, Customer
+from utils.testing import MODERATED, create_event, create_organization
+
+
+class TimelineTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizations = [
+            create_organization(name, f"{name}@test.com")
+            for name in ("Followed", "Other")
+        ]
+        user = CustomUser.objects.create(email="fan@test.com", password="foo")
+        cls.customer = Customer.objects.create(user=user, username="fan")
+
+    def create_event(self, organization, starts_in=timedelta(days=1), **fields):
+        return create_event(
+            organization,
+            f"{organization.name} event",
+            timezone.now() + starts_in,
+            **fields,
+        )
+
+    def follow(self, organization):
+        self.client.force_authenticate(self.customer.user)
+        url = reverse("organization-follow", kwargs={"pk": organization.pk})
+        return self.client.post(url)
+
+    def timeline(self):
+        response = self.client.get(reverse("events-timeline"))
+        self.assertEqual(response.status_code, 200)
+        return [event["id"] for event in response.data["results"]]
+
+    def test_moderation_fans_out_to_followers(self):
+        followed, other = self.organizations
+        self.follow(followed)
+        event = self.create_event(followed)
+        self.create_event(other, moderation_status=MODERATED)
+        self.assertEqual(self.timeline(), [])
+
+        event.moderation_status = MODERATED
+        event.save()
+        self.assertEqual(TimelineEntry.objects.count(), 1)
+        self.assertEqual(self.timeline(), [event.pk])
+
+    def test_follow_backfills_and_unfollow_withdraws(self):
+        followed, _ = self.organizations
+        upcoming = self.create_event(followed, moderation_status=MODERATED)
+        self.create_event(
+            followed, starts_in=timedelta(days=-2), moderation_status=MODERATED
+        )
+        self.follow(followed)
+        self.assertEqual(self.timeline(), [upcoming.pk])
+
+        self.follow(followed)
+        self.assertEqual(self.timeline(), [])
+        self.assertFalse(TimelineEntry.objects.exists())
+
+    @override_settings(TIMELINE_FANOUT_MAX_FOLLOWERS=0)
+    def test_large_organizations_are_read_at_request_time(self):
+        followed, _ = self.organizations
+        self.follow(followed)
+        event = self.create_event(followed, moderation_status=MODERATED)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.timeline(), [event.pk])
+
+    @override_settings(TIMELINE_FANOUT_MAX_FOLLOWERS=1)
+    def test_shrinking_organization_is_fanned_out_again(self):
+        followed, _ = self.organizations
+        user = CustomUser.objects.create(email="other@test.com", password="foo")
+        Customer.objects.create(user=user, username="other")
+        self.client.force_authenticate(user)
+        self.client.post(reverse("organization-follow", kwargs={"pk": followed.pk}))
+        self.follow(followed)
+        events = [
+            self.create_event(followed, moderation_status=MODERATED) for _ in range(3)
+        ]
+        self.assertFalse(TimelineEntry.objects.exists())
+
+        self.client.force_authenticate(user)
+        # One statement pairs followers and events, whatever their number.
+        with self.assertNumQueries(6):
+            self.client.post(reverse("organization-follow", kwargs={"pk": followed.pk}))
+        self.assertCountEqual(
+            TimelineEntry.objects.values_list("user", "event"),
+            [(self.customer.user.pk, event.pk) for event in events],
+        )
+        self.client.force_authenticate(self.customer.user)
+        self.assertCountEqual(self.timeline(), [event.pk for event in events])
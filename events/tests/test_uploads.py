@@ -0,0 +1,120 @@
+import time
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from events.models import EventImage
+from events.serializers import EventCreateSerializer
+from utils.testing import TemporaryMediaMixin, create_organization
+
+
+class DirectUploadTests(TemporaryMediaMixin, APITestCase):
+    media_settings = {
+        "UPLOADS_BACKEND": "utils.uploads.LocalUploadBackend",
+        "UPLOAD_MAX_SIZE": 1024,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = create_organization()
+        cls.other = create_organization("Other Organization", "other@test.com")
+
+    def issue(self, organization, size=100):
+        self.client.force_authenticate(organization.user)
+        response = self.client.post(
+            reverse("event-image-upload", kwargs={"pk": organization.pk}),
+            {"content_type": "image/png", "size": size},
+            format="json",
+        )
+        self.client.force_authenticate(None)
+        return response
+
+    def upload(self, upload, content=b"png bytes", content_type="image/png"):
+        return self.client.generic(
+            upload["method"], upload["url"], content, content_type=content_type
+        )
+
+    def create(self, image_keys):
+        self.client.force_authenticate(self.organization.user)
+        now = int(time.time())
+        data = {
+            "title": "Event",
+            "description": "Uploaded directly",
+            "location": "Bishkek",
+            "start_time": now,
+            "end_time": now + 3600,
+            "image_keys": image_keys,
+        }
+        return self.client.post(
+            reverse("onetime-event-create", kwargs={"pk": self.organization.pk}),
+            data,
+            format="json",
+        )
+
+    def test_event_references_uploaded_image(self):
+        upload = self.issue(self.organization).data
+        self.assertTrue(upload["key"].startswith(f"uploads/{self.organization.pk}/"))
+        self.assertEqual(upload["method"], "PUT")
+        self.assertEqual(self.upload(upload).status_code, 204)
+
+        response = self.create([upload["key"]])
+        self.assertEqual(response.status_code, 201)
+        image = EventImage.objects.get(event_id=response.data["id"])
+        self.assertEqual(image.image.name, upload["key"])
+        self.assertEqual(image.image_variants, {})
+        with image.image.open("rb") as file:
+            self.assertEqual(file.read(), b"png bytes")
+
+    def test_key_must_be_uploaded(self):
+        upload = self.issue(self.organization).data
+        response = self.create([upload["key"]])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("has not been uploaded", str(response.data))
+
+    def test_key_of_another_organization(self):
+        upload = self.issue(self.other).data
+        self.upload(upload)
+        response = self.create([upload["key"]])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(EventImage.objects.exists())
+
+    def test_key_is_used_once(self):
+        upload = self.issue(self.organization).data
+        self.upload(upload)
+        self.assertEqual(self.create([upload["key"]]).status_code, 201)
+        self.assertEqual(self.create([upload["key"]]).status_code, 400)
+
+    def test_concurrent_reuse_is_rejected(self):
+        upload = self.issue(self.organization).data
+        self.upload(upload)
+        # Both requests pass the reuse check before either has inserted its row.
+        with mock.patch.object(
+            EventCreateSerializer, "validate_image_keys", lambda self, value: value
+        ):
+            self.assertEqual(self.create([upload["key"]]).status_code, 201)
+            response = self.create([upload["key"]])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("only be used once", str(response.data))
+        self.assertEqual(EventImage.objects.count(), 1)
+
+    def test_limits_are_enforced(self):
+        self.assertEqual(self.issue(self.organization, size=2048).status_code, 400)
+
+        upload = self.issue(self.organization).data
+        self.assertEqual(self.upload(upload, b"x" * 2048).status_code, 400)
+        self.assertEqual(
+            self.upload(upload, content_type="image/jpeg").status_code, 400
+        )
+
+        upload["url"] = upload["url"].replace("/uploads/", "/uploads/x")
+        self.assertEqual(self.upload(upload).status_code, 403)
+
+    def test_only_owner_issues_uploads(self):
+        self.client.force_authenticate(self.other.user)
+        response = self.client.post(
+            reverse("event-image-upload", kwargs={"pk": self.organization.pk}),
+            {"content_type": "image/png", "size": 100},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
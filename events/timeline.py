@@ -0,0 +1,120 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+
+from events.models import Event, TimelineEntry
+from users.models import FollowingOrganization, Organization
+from utils.db.filters import EventFilter
+
+# Events of organizations with more followers than TIMELINE_FANOUT_MAX_FOLLOWERS
+# are not copied to inboxes; timelines read them from the events table instead,
+# so a single moderation never writes millions of rows.
+
+
+def fan_out(event, batch_size=1000):
+    """Add ``event`` to the inbox of every follower of its organization."""
+    followers = FollowingOrganization.objects.filter(
+        following=event.organization_id,
+        following__following_count__lte=settings.TIMELINE_FANOUT_MAX_FOLLOWERS,
+    ).values_list("follower_id", flat=True)
+
+    batch = []
+    for user_id in followers.iterator(chunk_size=batch_size):
+        batch.append(TimelineEntry(user_id=user_id, event_id=event.pk))
+        if len(batch) == batch_size:
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def backfill(user_id, organization_id, now=None):
+    """Add the upcoming events of a newly followed organization to an inbox."""
+    events = (
+        EventFilter(Event, now=now)
+        .moderated()
+        .upcoming(True)
+        .where(
+            Q(
+                organization_id=organization_id,
+                organization__following_count__lte=(
+                    settings.TIMELINE_FANOUT_MAX_FOLLOWERS
+                ),
+            )
+        )
+        .queryset()
+    )
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=user_id, event_id=pk)
+            for pk in events.values_list("pk", flat=True)
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def resume_fan_out(organization_id, now=None):
+    """
+    Fan out the upcoming events of an organization whose follower count just
+    fell back to ``TIMELINE_FANOUT_MAX_FOLLOWERS``.
+
+    Its events published while it was larger were never copied to inboxes,
+    and timelines stop reading them from the events table once it is small
+    again. Call after the counter update, in the same transaction: the row
+    lock serializes concurrent unfollows, so exactly one sees the crossing.
+    Followers and events are paired in a single ``INSERT ... SELECT``, so the
+    statement count does not grow with either.
+    """
+    events = (
+        EventFilter(Event, now=now)
+        .moderated()
+        .upcoming(True)
+        .where(
+            Q(
+                organization_id=organization_id,
+                organization__following_count=settings.TIMELINE_FANOUT_MAX_FOLLOWERS,
+            )
+        )
+        .queryset()
+        .values("pk")
+    )
+    events_sql, events_params = events.query.sql_with_params()
+
+    quote = connection.ops.quote_name
+    following = FollowingOrganization._meta
+    entries = TimelineEntry._meta
+    columns = (
+        entries.get_field("user").column,
+        entries.get_field("event").column,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(entries.db_table)} "
+            f"({', '.join(map(quote, columns))}) "
+            f"SELECT f.{quote(following.get_field('follower').column)}, "
+            f"e.{quote(Event._meta.pk.column)} "
+            f"FROM {quote(following.db_table)} f CROSS JOIN ({events_sql}) e "
+            f"WHERE f.{quote(following.get_field('following').column)} = %s "
+            "ON CONFLICT DO NOTHING",
+            (*events_params, organization_id),
+        )
+
+
+def withdraw(user_id, organization_id):
+    TimelineEntry.objects.filter(
+        user_id=user_id, event__organization_id=organization_id
+    ).delete()
+
+
+def timeline_condition(user_id):
+    """
+    Events in the user's inbox, plus events of followed organizations too
+    large to fan out.
+    """
+    large = Organization.objects.filter(
+        followers__follower_id=user_id,
+        following_count__gt=settings.TIMELINE_FANOUT_MAX_FOLLOWERS,
+    ).values("pk")
+    return Q(
+        pk__in=TimelineEntry.objects.filter(user_id=user_id).values("event_id")
+    ) | Q(organization_id__in=large)
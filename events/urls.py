@@ -8,9 +8,19 @@ from events.views import (
     RegularEventDetailView,
     OneTimeEventCreateView,
     RegularEventCreateView, EventFavouriteView,
+    EventInterestListView,
+    EventCommentListView,
+    EventFeedView,
+    EventPersonalFeedView,
+    EventTimelineView,
+    EventImageUploadView,
+    LocalUploadView,
 )
 
 urlpatterns = [
+    path("events/", EventFeedView.as_view(), name="events"),
+    path("events/for-you/", EventPersonalFeedView.as_view(), name="events-for-you"),
+    path("events/timeline/", EventTimelineView.as_view(), name="events-timeline"),
     path("events/onetime/", OneTimeEventAPIView.as_view(), name="onetime-events"),
     path(
         "events/onetime/<int:pk>",
@@ -24,18 +34,38 @@ urlpatterns = [
         name="regular-events-detail",
     ),
     path("events/categories/", CategoryAPIView.as_view(), name="categories"),
+    path(
+        "events/<int:pk>/comments/",
+        EventCommentListView.as_view(),
+        name="event-comments",
+    ),
     path(
         "events/<int:pk>/comment/",
         EventCommentCreateAPIView.as_view(),
         name="comment-create",
     ),
     path(
-        "organization/<int:pk>/events/onetime/create/", OneTimeEventCreateView.as_view()
+        "organization/<int:pk>/events/uploads/",
+        EventImageUploadView.as_view(),
+        name="event-image-upload",
+    ),
+    path("uploads/<str:token>/", LocalUploadView.as_view(), name="local-upload"),
+    path(
+        "organization/<int:pk>/events/onetime/create/",
+        OneTimeEventCreateView.as_view(),
+        name="onetime-event-create",
     ),
     path(
-        "organization/<int:pk>/events/regular/create/", RegularEventCreateView.as_view()
+        "organization/<int:pk>/events/regular/create/",
+        RegularEventCreateView.as_view(),
+        name="regular-event-create",
     ),
 
+    path(
+        "events/<int:pk>/interested/",
+        EventInterestListView.as_view(),
+        name="event-interested",
+    ),
     path(
         "events/<int:pk>/add-to-favourite/",
         EventFavouriteView.as_view(),
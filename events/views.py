@@ -5,13 +5,21 @@ from rest_framework.response import Response
 from rest_framework.parsers import JSONParser
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.pagination import LimitOffsetPagination
-from drf_spectacular.utils import extend_schema, OpenApiParameter
-from rest_framework.generics import CreateAPIView, RetrieveAPIView
+from drf_spectacular.utils import (
+    extend_schema,
+    OpenApiParameter,
+    PolymorphicProxySerializer,
+)
+from rest_framework.generics import CreateAPIView, ListAPIView
 from rest_framework import viewsets, mixins
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.serializers import ValidationError
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.core import signing
+from django.http import Http404
 
 from events.models import (
     OneTimeEvent,
@@ -21,88 +29,259 @@ from events.models import (
     EventPromotion,
     EventCategory,
     EventImage,
-    Event, EventInterest,
+    Event,
+    EventInterest,
 )
 from events.permissions import IsOwnerOrDenied
 from events.serializers import (
     OneTimeEventSerializer,
     RegularEventSerializer,
     EventCommentSerializer,
+    EventCommentInlineSerializer,
+    EventInterestSerializer,
     OneTimeEventDetailSerializer,
     RegularEventDetailSerializer,
     CategorySerializer,
     OneTimeEventCreateSerializer,
     RegularEventCreateSerializer,
+    PolymorphicEventSerializer,
+    ImageUploadSerializer,
+)
+from users.models import Customer, Organization
+from utils.cache import CATEGORIES, EVENTS, cache_response, invalidate
+from utils.db.filters import EventFilter
+from utils.db.prefetch import EagerLoadingViewMixin
+from utils.db.routers import ReplicaReadMixin
+from utils.db.queries import (
+    FEED_ORDERINGS,
+    get_categories,
+    get_event_feed,
+    get_personal_feed,
+    get_timeline,
+    toggle,
+)
+from utils.uploads import LocalUploadBackend, get_upload_backend, upload_key
+from utils.views import AsyncAPIView
+from utils.pagination import (
+    CappedLimitOffsetPagination,
+    KeysetPagination,
+    NewestFirstCursorPagination,
 )
-from users.models import Organization
-from utils.db.queries import get_events, get_categories
-
 
-class EventAPIView(APIView):
+PAGINATION_PARAMETERS = [
+    OpenApiParameter(name="limit", type=int),
+    OpenApiParameter(name="offset", type=int),
+    OpenApiParameter(
+        name="cursor",
+        type=str,
+        description="Opaque cursor; pass an empty value to start cursor "
+        "pagination. Not available with keyword",
+    ),
+    OpenApiParameter(name="page_size", type=int),
+]
+
+DATE_PARAMETERS = [
+    OpenApiParameter(
+        name="start_time",
+        type=int,
+        description="Unix timestamp; events starting on the same local day",
+    ),
+    OpenApiParameter(name="from", type=int, description="Unix timestamp, inclusive"),
+    OpenApiParameter(name="to", type=int, description="Unix timestamp, exclusive"),
+    OpenApiParameter(name="when", type=str, enum=EventFilter.shortcuts),
+    OpenApiParameter(
+        name="upcoming", type=bool, description="Only events that have not finished"
+    ),
+]
+
+FILTER_PARAMETERS = [
+    OpenApiParameter(
+        name="keyword",
+        type=str,
+        description="Full-text search over title, description and organization",
+    ),
+    OpenApiParameter(name="category", type=int),
+    *DATE_PARAMETERS,
+]
+
+
+class EventAPIView(ReplicaReadMixin, AsyncAPIView):
     serializer_class = OneTimeEventSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = CappedLimitOffsetPagination
+    cursor_pagination_class = KeysetPagination
     model = OneTimeEvent
 
     @extend_schema(
         responses=serializer_class(many=True),
+        parameters=[*PAGINATION_PARAMETERS, *FILTER_PARAMETERS],
+    )
+    @cache_response(EVENTS)
+    async def get(self, request):
+        events = (
+            EventFilter(self.model)
+            .from_query_params(request.query_params)
+            .queryset(ordering=("-start_time",))
+        )
+        return await self.get_paginated_response(request, events)
+
+    def get_paginator(self, request):
+        params = request.query_params
+        if "cursor" in params or "page_size" in params:
+            # The keyset follows start_time and would drop the relevance order.
+            if params.get("keyword"):
+                raise ValidationError(
+                    {
+                        "Detail": "Keyword searches are paginated with limit "
+                        "and offset, not cursor or page_size"
+                    }
+                )
+            return self.cursor_pagination_class()
+        return self.pagination_class()
+
+    async def get_paginated_response(self, request, events):
+        events = self.serializer_class.setup_eager_loading(events)
+        paginator = self.get_paginator(request)
+        result_page = await paginator.apaginate_queryset(
+            queryset=events, request=request
+        )
+        data = await self.serialize(result_page, many=True)
+        response = paginator.get_paginated_response(data)
+        return Response(response.data, status=status.HTTP_200_OK)
+
+
+class EventFeedView(ReplicaReadMixin, AsyncAPIView):
+    serializer_class = PolymorphicEventSerializer
+    pagination_class = CappedLimitOffsetPagination
+
+    @extend_schema(
+        responses=PolymorphicProxySerializer(
+            component_name="Event",
+            serializers=[OneTimeEventSerializer, RegularEventSerializer],
+            resource_type_field_name=None,
+            many=True,
+        ),
+        parameters=[
+            OpenApiParameter(name="limit", type=int),
+            OpenApiParameter(name="offset", type=int),
+            *FILTER_PARAMETERS,
+            OpenApiParameter(
+                name="event_type", type=str, enum=list(EventFilter.event_types)
+            ),
+            OpenApiParameter(
+                name="ordering",
+                type=str,
+                enum=list(FEED_ORDERINGS),
+                description="next_occurrence (default) lists only events that "
+                "have not finished, unless a date filter or keyword is given",
+            ),
+        ],
+    )
+    @cache_response(EVENTS)
+    async def get(self, request):
+        events = get_event_feed(request.query_params)
+
+        paginator = self.pagination_class()
+        result_page = await paginator.apaginate_queryset(
+            queryset=events, request=request
+        )
+        data = await self.serialize(result_page, many=True)
+        response = paginator.get_paginated_response(data)
+        return Response(response.data, status=status.HTTP_200_OK)
+
+
+class EventPersonalFeedView(ReplicaReadMixin, APIView):
+    """Upcoming events in the current customer's interest categories."""
+
+    serializer_class = PolymorphicEventSerializer
+    pagination_class = CappedLimitOffsetPagination
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        responses=PolymorphicProxySerializer(
+            component_name="Event",
+            serializers=[OneTimeEventSerializer, RegularEventSerializer],
+            resource_type_field_name=None,
+            many=True,
+        ),
         parameters=[
             OpenApiParameter(name="limit", type=int),
             OpenApiParameter(name="offset", type=int),
-            OpenApiParameter(name="keyword", type=str),
-            OpenApiParameter(name="category", type=int),
         ],
     )
     def get(self, request):
         self.check_permissions(request)
-        paginator = self.pagination_class()
-        search_keyword = request.query_params.get("keyword")
-        category = request.query_params.get("category")
+        customer = Customer.objects.filter(user=request.user).first()
+        if customer is None:
+            raise PermissionDenied("Only customers have a personal feed.")
+        events = get_personal_feed(customer)
 
-        events = get_events(category=category, keyword=search_keyword, type=self.model)
+        paginator = self.pagination_class()
         result_page = paginator.paginate_queryset(queryset=events, request=request)
-        serializer = self.serializer_class(result_page, many=True)
+        serializer = self.serializer_class(
+            result_page, many=True, context={"request": request}
+        )
         response = paginator.get_paginated_response(serializer.data)
         return Response(response.data, status=status.HTTP_200_OK)
 
 
-class OneTimeEventAPIView(EventAPIView):
-    serializer_class = OneTimeEventSerializer
-    queryset = OneTimeEvent.objects.filter(moderation_status="модерация пройдена")
+class EventTimelineView(ReplicaReadMixin, APIView):
+    """Upcoming events of the organizations the current user follows."""
+
+    serializer_class = PolymorphicEventSerializer
+    pagination_class = CappedLimitOffsetPagination
+    permission_classes = (IsAuthenticated,)
 
     @extend_schema(
-        responses=serializer_class(many=True),
+        responses=PolymorphicProxySerializer(
+            component_name="Event",
+            serializers=[OneTimeEventSerializer, RegularEventSerializer],
+            resource_type_field_name=None,
+            many=True,
+        ),
         parameters=[
-            OpenApiParameter(name="keyword", type=str),
-            OpenApiParameter(name="category", type=int),
-            OpenApiParameter(name="start_time", type=int),
+            OpenApiParameter(name="limit", type=int),
+            OpenApiParameter(name="offset", type=int),
         ],
     )
     def get(self, request):
         self.check_permissions(request)
+        events = get_timeline(request.user)
+
         paginator = self.pagination_class()
-        search_keyword = request.query_params.get("keyword")
-        category = request.query_params.get("category")
-        start_time = request.query_params.get("start_time")
-
-        events = get_events(
-            category=category,
-            keyword=search_keyword,
-            start_time=start_time,
-            type=self.model,
-        )
         result_page = paginator.paginate_queryset(queryset=events, request=request)
-        serializer = self.serializer_class(result_page, many=True)
+        serializer = self.serializer_class(
+            result_page, many=True, context={"request": request}
+        )
         response = paginator.get_paginated_response(serializer.data)
         return Response(response.data, status=status.HTTP_200_OK)
 
 
+class OneTimeEventAPIView(EventAPIView):
+    serializer_class = OneTimeEventSerializer
+    queryset = OneTimeEvent.objects.filter(moderation_status="модерация пройдена")
+
+    @extend_schema(
+        responses=serializer_class(many=True),
+        parameters=[*PAGINATION_PARAMETERS, *FILTER_PARAMETERS],
+    )
+    async def get(self, request):
+        return await super().get(request)
+
+
 class RegularEventAPIView(EventAPIView):
     serializer_class = RegularEventSerializer
     queryset = RegularEvent.objects.filter(moderation_status="модерация пройдена")
     model = RegularEvent
 
+    @extend_schema(
+        responses=serializer_class(many=True),
+        parameters=[*PAGINATION_PARAMETERS, *FILTER_PARAMETERS],
+    )
+    async def get(self, request):
+        return await super().get(request)
+
 
-class CategoryAPIView(APIView):
+class CategoryAPIView(AsyncAPIView):
     serializer_class = CategorySerializer
     model = Category
 
@@ -112,25 +291,60 @@ class CategoryAPIView(APIView):
             OpenApiParameter(name="is_not_empty", type=bool),
         ],
     )
-    def get(self, request):
+    @cache_response(CATEGORIES)
+    async def get(self, request):
         is_not_empty = request.query_params.get("is_not_empty")
-        categories = get_categories(is_not_empty)
-        serializer = self.serializer_class(data=categories, many=True)
-        if serializer.is_valid():
-            return Response(serializer.data, status.HTTP_400_BAD_REQUEST)
-        return Response(serializer.data, status.HTTP_200_OK)
+        categories = [category async for category in get_categories(is_not_empty)]
+        data = await self.serialize(categories, many=True)
+        return Response(data, status.HTTP_200_OK)
 
 
-class OneTimeEventDetailView(RetrieveAPIView):
+class EventDetailView(ReplicaReadMixin, AsyncAPIView):
     serializer_class = OneTimeEventDetailSerializer
     queryset = OneTimeEvent.objects.all()
-    lookup_url_kwarg = "pk"
 
+    async def get(self, request, pk):
+        queryset = self.serializer_class.setup_eager_loading(self.queryset)
+        try:
+            event = await queryset.aget(pk=pk)
+        except ObjectDoesNotExist:
+            raise NotFound
+        return Response(await self.serialize(event))
+
+
+class OneTimeEventDetailView(EventDetailView):
+    serializer_class = OneTimeEventDetailSerializer
+    queryset = OneTimeEvent.objects.all()
 
-class RegularEventDetailView(RetrieveAPIView):
+    @extend_schema(responses=OneTimeEventDetailSerializer)
+    async def get(self, request, pk):
+        return await super().get(request, pk)
+
+
+class RegularEventDetailView(EventDetailView):
     serializer_class = RegularEventDetailSerializer
     queryset = RegularEvent.objects.all()
-    lookup_url_kwarg = "pk"
+
+    @extend_schema(responses=RegularEventDetailSerializer)
+    async def get(self, request, pk):
+        return await super().get(request, pk)
+
+
+class EventInterestListView(ReplicaReadMixin, EagerLoadingViewMixin, ListAPIView):
+    serializer_class = EventInterestSerializer
+    queryset = EventInterest.objects.order_by("-id")
+
+    def get_queryset(self):
+        return super().get_queryset().filter(event_id=self.kwargs["pk"])
+
+
+class EventCommentListView(ReplicaReadMixin, EagerLoadingViewMixin, ListAPIView):
+    serializer_class = EventCommentInlineSerializer
+    pagination_class = NewestFirstCursorPagination
+    queryset = EventComment.objects.all()
+
+    def get_queryset(self):
+        return super().get_queryset().filter(event_id=self.kwargs["pk"])
 
 
 class EventCommentCreateAPIView(CreateAPIView):
@@ -143,24 +357,78 @@ class EventCommentCreateAPIView(CreateAPIView):
         serializer.save(user=self.request.user, event=event)
 
 
+class EventImageUploadView(APIView):
+    """
+    Issue a URL the client uploads an event image to directly, bypassing the
+    API workers; the returned key is then passed in ``image_keys`` on create.
+    """
+
+    serializer_class = ImageUploadSerializer
+    parser_classes = (JSONParser,)
+    permission_classes = (IsOwnerOrDenied,)
+
+    @extend_schema(request=ImageUploadSerializer, responses=ImageUploadSerializer)
+    def post(self, request, pk):
+        serializer = ImageUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        content_type = serializer.validated_data["content_type"]
+
+        key = upload_key(pk, content_type)
+        upload = get_upload_backend().issue(key, content_type, request=request)
+        return Response(
+            ImageUploadSerializer({"key": key, **upload}).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
+@extend_schema(exclude=True)
+class LocalUploadView(APIView):
+    """Receives the uploads issued by ``LocalUploadBackend`` (development only)."""
+
+    authentication_classes = ()
+    permission_classes = ()
+
+    def put(self, request, token):
+        backend = get_upload_backend()
+        if not isinstance(backend, LocalUploadBackend):
+            raise Http404
+        try:
+            upload = backend.load(token)
+        except signing.BadSignature:
+            raise PermissionDenied("The upload URL is invalid or has expired.")
+
+        if request.content_type != upload["content_type"]:
+            raise ValidationError(
+                {"Detail": f"Content-Type must be {upload['content_type']}."}
+            )
+        # Read the stream directly: request.body is capped far below images.
+        content = (
+            request.stream.read(settings.UPLOAD_MAX_SIZE + 1) if request.stream else b""
+        )
+        if not content:
+            raise ValidationError({"Detail": "The image is empty."})
+        if len(content) > settings.UPLOAD_MAX_SIZE:
+            raise ValidationError({"Detail": "The image is too large."})
+
+        backend.save(upload["key"], content)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class EventCreateView(CreateAPIView):
     serializer_class = OneTimeEventCreateSerializer
     queryset = OneTimeEvent.objects.all()
-    parser_classes = (MultiPartParser,)
+    # Images uploaded beforehand are referenced by key, so JSON is enough.
+    parser_classes = (MultiPartParser, JSONParser)
     permission_classes = (IsOwnerOrDenied,)
 
     @extend_schema(request=OneTimeEventCreateSerializer)
     def post(self, request, *args, **kwargs):
-        request.data._mutable = True
-
-        if request.data["images"] == "":
-            del request.data["images"]
+        if hasattr(request.data, "_mutable"):
+            request.data._mutable = True
 
-        if request.data["promotions"] == "":
-            del request.data["promotions"]
-
-        if request.data["categories"] == "":
-            del request.data["categories"]
+        for field in ("images", "image_keys", "promotions", "categories"):
+            if request.data.get(field) == "":
+                del request.data[field]
 
         return super().post(request, *args, **kwargs)
 
@@ -171,7 +439,7 @@ class EventCreateView(CreateAPIView):
 class OneTimeEventCreateView(EventCreateView):
     serializer_class = OneTimeEventCreateSerializer
     queryset = OneTimeEvent.objects.all()
-    parser_classes = (MultiPartParser,)
+    parser_classes = (MultiPartParser, JSONParser)
     permission_classes = (IsOwnerOrDenied,)
 
     @extend_schema(request=OneTimeEventCreateSerializer)
@@ -182,7 +450,7 @@ class OneTimeEventCreateView(EventCreateView):
 class RegularEventCreateView(EventCreateView):
     serializer_class = RegularEventCreateSerializer
     queryset = RegularEvent.objects.all()
-    parser_classes = (MultiPartParser,)
+    parser_classes = (MultiPartParser, JSONParser)
     permission_classes = (IsOwnerOrDenied,)
 
     @extend_schema(request=RegularEventCreateSerializer)
@@ -191,7 +459,7 @@ class RegularEventCreateView(EventCreateView):
 
 
 class EventFavouriteView(APIView):
-    permission_classes = (IsAuthenticated, )
+    permission_classes = (IsAuthenticated,)
 
     def post(self, request, pk):
         self.check_permissions(request)
@@ -203,30 +471,21 @@ class EventFavouriteView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        event = Event.objects.filter(id=pk)
-        if not event:
+        delta = toggle(EventInterest, user=user.pk, event=pk)
+        if delta is None:
             return Response(
-                {
-                    "Detail": "The event with the given event_id does not exist."
-                },
+                {"Detail": "The event with the given event_id does not exist."},
                 status=status.HTTP_404_NOT_FOUND,
             )
+        # Raw statements bypass the model signals.
+        invalidate(EVENTS)
 
-        if EventInterest.objects.filter(
-            user=user, event=event.first()
-        ).exists():
-            EventInterest.objects.filter(
-                user=user, event=event.first()
-            ).delete()
+        if delta < 0:
             return Response(
                 {"Detail": "You have unstarred this event."},
                 status=status.HTTP_200_OK,
             )
-
-        EventInterest.objects.create(
-            user=user, event=event.first()
-        )
         return Response(
             {"Detail": "You have starred event."},
             status=status.HTTP_201_CREATED,
-        )
\ No newline at end of file
+        )
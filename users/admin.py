@@ -1,5 +1,5 @@
 from django.contrib import admin
-from users.models import CustomUser, Customer, Organization
+from users.models import CustomUser, Customer, Organization, OutgoingEmail
 
 
 class UserAdmin(admin.ModelAdmin):
@@ -32,3 +32,10 @@ class CustomerAdmin(admin.ModelAdmin):
 class OrganizationAdmin(admin.ModelAdmin):
     icon_name = "group"
     list_display = ("id", "user", "name", "type", "following_count")
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    icon_name = "email"
+    list_display = ("id", "subject", "to", "status", "attempts", "created_at")
+    list_filter = ("status",)
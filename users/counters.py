@@ -0,0 +1,35 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def adjust_following_count(model, pk, delta):
+    """Atomically shift the denormalized follower counter of one profile."""
+    if not delta:  # nothing changed, or the toggle target does not exist
+        return
+    model.objects.filter(pk=pk).update(following_count=F("following_count") + delta)
+
+
+def follower_count(follow_model):
+    """Number of ``follow_model`` rows pointing at the outer profile."""
+    followers = (
+        follow_model.objects.filter(following=OuterRef("pk"))
+        .order_by()
+        .values("following")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(followers), 0)
+
+
+def reconcile_following_counts(model, follow_model):
+    """
+    Recount the followers of every ``model`` profile from ``follow_model``
+    and rewrite the counters that drifted. Returns the number of repaired rows.
+    Takes the models as arguments so migrations can pass historical ones.
+    """
+    drifted = model.objects.annotate(actual=follower_count(follow_model)).exclude(
+        following_count=F("actual")
+    )
+    return model.objects.filter(pk__in=drifted.values("pk")).update(
+        following_count=follower_count(follow_model)
+    )
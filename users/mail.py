@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+
+
+def queue_email(subject, body, to, html_body="", from_email=None):
+    """
+    Add an email to the outbox. The row is part of the caller's transaction,
+    so nothing is sent for a request that rolls back.
+    """
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        html_body=html_body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL or "",
+        to=list(to),
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff: the base delay doubles with every failed attempt."""
+    return timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def build_message(email, connection):
+    message = EmailMultiAlternatives(
+        email.subject,
+        email.body,
+        email.from_email or None,
+        email.to,
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
+
+
+def deliver_pending(batch_size=50):
+    """
+    Send the due outbox emails over a single backend connection, opened
+    only when there is at least one.
+
+    Each batch is claimed in a short transaction: rows are locked with
+    ``SKIP LOCKED``, so several workers can share the outbox, and leased by
+    pushing ``next_attempt_at`` past the time every send of the batch could
+    take. The emails are then sent outside of any transaction and each row
+    is written back on its own, so a crash resends at most the email it
+    interrupted. A failed email is retried with backoff until it has used
+    ``EMAIL_OUTBOX_MAX_ATTEMPTS``. Returns the number of sent emails.
+    """
+    sent = 0
+    connection = None
+    lease = timedelta(seconds=settings.EMAIL_TIMEOUT * batch_size)
+    try:
+        while True:
+            leased_until = timezone.now() + lease
+            with transaction.atomic():
+                batch = list(
+                    OutgoingEmail.objects.filter(
+                        status=OutgoingEmail.PENDING,
+                        next_attempt_at__lte=timezone.now(),
+                    )
+                    .order_by("next_attempt_at")
+                    .select_for_update(skip_locked=True)[:batch_size]
+                )
+                # Attempts are counted on claim, so an email that crashes the
+                # worker still runs out of them.
+                OutgoingEmail.objects.filter(
+                    pk__in=[email.pk for email in batch]
+                ).update(next_attempt_at=leased_until, attempts=F("attempts") + 1)
+            if not batch:
+                return sent
+            if connection is None:
+                # Polling an empty outbox must not log in to the server.
+                connection = get_connection()
+                connection.open()
+            for email in batch:
+                deliver(email, connection)
+                OutgoingEmail.objects.filter(
+                    pk=email.pk, next_attempt_at=leased_until
+                ).update(
+                    status=email.status,
+                    attempts=email.attempts,
+                    next_attempt_at=email.next_attempt_at,
+                    last_error=email.last_error,
+                    sent_at=email.sent_at,
+                )
+                sent += email.status == OutgoingEmail.SENT
+    finally:
+        if connection is not None:
+            connection.close()
+
+
+def deliver(email, connection):
+    email.attempts += 1
+    try:
+        build_message(email, connection).send()
+    except Exception as error:
+        # The server may have dropped the connection; the next send reopens it.
+        connection.close()
+        email.last_error = f"{type(error).__name__}: {error}"
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = OutgoingEmail.FAILED
+        else:
+            email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+    else:
+        email.status = OutgoingEmail.SENT
+        email.sent_at = timezone.now()
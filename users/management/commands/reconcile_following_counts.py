@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from users.counters import reconcile_following_counts
+from users.models import Customer, Following, FollowingOrganization, Organization
+from utils.cache import ORGANIZATIONS, invalidate
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount followers of customers and organizations and repair drifted counters"
+    )
+
+    def handle(self, *args, **options):
+        customers = reconcile_following_counts(Customer, Following)
+        organizations = reconcile_following_counts(Organization, FollowingOrganization)
+        if organizations:
+            invalidate(ORGANIZATIONS)
+
+        self.stdout.write(
+            f"Repaired {customers} customer and {organizations} organization counters"
+        )
@@ -0,0 +1,35 @@
+import smtplib
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.mail import deliver_pending
+
+
+class Command(BaseCommand):
+    help = "Deliver the queued outbox emails"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep polling for new emails every INTERVAL seconds",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent = deliver_pending(options["batch_size"])
+            except (smtplib.SMTPException, OSError) as error:
+                # The mail server is unreachable; the emails stay queued.
+                if not options["interval"]:
+                    raise
+                self.stderr.write(f"Could not connect to the mail server: {error}")
+            else:
+                if sent:
+                    self.stdout.write(f"Sent {sent} emails")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,35 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:01
+
+from django.db import migrations, models
+
+
+def populate_following_counts(apps, schema_editor):
+    from users.counters import reconcile_following_counts
+
+    reconcile_following_counts(
+        apps.get_model("users", "Customer"), apps.get_model("users", "Following")
+    )
+    reconcile_following_counts(
+        apps.get_model("users", "Organization"),
+        apps.get_model("users", "FollowingOrganization"),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_trigram_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customer",
+            name="following_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="organization",
+            name="following_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_following_counts, migrations.RunPython.noop),
+    ]
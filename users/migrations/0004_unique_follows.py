@@ -0,0 +1,43 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:02
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_follows(apps, schema_editor):
+    from users.counters import reconcile_following_counts
+
+    for model_name, profile_name in (
+        ("Following", "Customer"),
+        ("FollowingOrganization", "Organization"),
+    ):
+        model = apps.get_model("users", model_name)
+        first = (
+            model.objects.values("follower", "following")
+            .annotate(first=Min("id"))
+            .values("first")
+        )
+        model.objects.exclude(id__in=first).delete()
+        reconcile_following_counts(apps.get_model("users", profile_name), model)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0003_following_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_follows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="following",
+            constraint=models.UniqueConstraint(
+                fields=("follower", "following"), name="unique_following"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="followingorganization",
+            constraint=models.UniqueConstraint(
+                fields=("follower", "following"), name="unique_following_organization"
+            ),
+        ),
+    ]
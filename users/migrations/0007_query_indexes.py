@@ -0,0 +1,42 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0006_outgoing_email"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="following",
+            name="follower",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="following",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="followingorganization",
+            name="follower",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="organizations_followed",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(
+                condition=models.Q(("verification_token__gt", "")),
+                fields=["verification_token"],
+                name="user_verification_token_idx",
+            ),
+        ),
+    ]
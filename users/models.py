@@ -4,6 +4,8 @@ from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 
 from users.managers import CustomUserManager
 
@@ -20,6 +22,16 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     objects = CustomUserManager()
 
+    class Meta:
+        indexes = [
+            # Only users with a pending email verification carry a token.
+            models.Index(
+                fields=["verification_token"],
+                name="user_verification_token_idx",
+                condition=models.Q(verification_token__gt=""),
+            ),
+        ]
+
     def __str__(self):
         return self.email
 
@@ -35,9 +47,25 @@ class Customer(models.Model):
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, primary_key=True)
     username = models.CharField(_("username"), max_length=100, unique=True)
     avatar = models.ImageField(upload_to="user_avatars/", null=True, blank=True)
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
     first_name = models.CharField(max_length=50, null=True, blank=True)
     last_name = models.CharField(max_length=50, null=True, blank=True)
     interests_ids = ArrayField(models.IntegerField(), blank=True, null=True)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                fields=["username"],
+                name="customer_username_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            # icontains compiles to UPPER(username) LIKE, which needs its own index.
+            GinIndex(
+                OpClass(Upper("username"), name="gin_trgm_ops"),
+                name="customer_username_itrgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.username
@@ -48,44 +76,113 @@ class Customer(models.Model):
 
         return Category.objects.filter(id__in=self.interests_ids)
 
-    @property
-    def following_count(self) -> int:
-        followers = Following.objects.filter(following=self.pk)
-        return followers.count() if followers else 0
-
 
 class Organization(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     name = models.CharField(max_length=100)
     avatar = models.ImageField(upload_to="organization_avatars/", null=True, blank=True)
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
     description = models.TextField(max_length=1500)
     type = models.CharField(max_length=100)
     phone_number = models.CharField(max_length=20, blank=True, null=True)
     address = models.CharField(max_length=200, blank=True, null=True)
     insta_link = models.CharField(max_length=30, blank=True, null=True)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                fields=["name"],
+                name="organization_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            # icontains compiles to UPPER(name) LIKE, which needs its own index.
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="organization_name_itrgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
-    @property
-    def following_count(self) -> int:
-        followers = FollowingOrganization.objects.filter(following=self.pk)
-        return followers.count() if followers else 0
-
 
 class Following(models.Model):
+    # Indexed by unique_following.
     follower = models.ForeignKey(
-        to=CustomUser, on_delete=models.CASCADE, related_name="following"
+        to=CustomUser,
+        on_delete=models.CASCADE,
+        related_name="following",
+        db_index=False,
     )
     following = models.ForeignKey(
         to=CustomUser, on_delete=models.CASCADE, related_name="followers"
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["follower", "following"], name="unique_following"
+            ),
+        ]
+
 
 class FollowingOrganization(models.Model):
+    # Indexed by unique_following_organization.
     follower = models.ForeignKey(
-        to=CustomUser, on_delete=models.CASCADE, related_name="organizations_followed"
+        to=CustomUser,
+        on_delete=models.CASCADE,
+        related_name="organizations_followed",
+        db_index=False,
     )
     following = models.ForeignKey(
         to=Organization, on_delete=models.CASCADE, related_name="followers"
     )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["follower", "following"],
+                name="unique_following_organization",
+            ),
+        ]
+
+
+class OutgoingEmail(models.Model):
+    """
+    Email queued by a request and delivered by the ``send_emails`` worker,
+    so no request waits on the mail server.
+    """
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUSES = (
+        (PENDING, "Pending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254, blank=True)
+    to = ArrayField(models.EmailField())
+    status = models.CharField(max_length=10, choices=STATUSES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                name="outgoing_email_pending_idx",
+                condition=models.Q(status="pending"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.to)}"
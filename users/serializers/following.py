@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+STATE_IDS_LIMIT = 100
+
+
+def state_ids_field():
+    return serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list,
+        max_length=STATE_IDS_LIMIT,
+    )
+
+
+class StateQuerySerializer(serializers.Serializer):
+    events = state_ids_field()
+    organizations = state_ids_field()
+    customers = state_ids_field()
+
+
+class StateSerializer(serializers.Serializer):
+    events = serializers.DictField(child=serializers.BooleanField())
+    organizations = serializers.DictField(child=serializers.BooleanField())
+    customers = serializers.DictField(child=serializers.BooleanField())
@@ -3,16 +3,16 @@ from typing import List, Dict
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from events.models import OneTimeEvent, RegularEvent
-from events.serializers import (
-    RegularEventProfileSerializer,
-    OneTimeEventProfileSerializer,
-)
+from events.serializers import PolymorphicEventProfileSerializer
 from users.models import Organization
+from utils.db.queries import annotate_event_type
+from utils.images import ImageVariantsField
 
 
 class OrganizationSerializer(serializers.ModelSerializer):
     user_id = serializers.SerializerMethodField()
+    avatar = serializers.ImageField(read_only=True)
+    avatar_variants = ImageVariantsField("avatar")
 
     class Meta:
         model = Organization
@@ -25,16 +25,17 @@ class OrganizationSerializer(serializers.ModelSerializer):
             "address",
             "phone_number",
             "insta_link",
+            "avatar",
+            "avatar_variants",
             "following_count",
         )
 
     @staticmethod
     def get_user_id(obj) -> int:
-        return obj.user.id
+        return obj.user_id
 
 
 class OrganizationProfileSerializer(OrganizationSerializer):
-
     class Meta:
         model = Organization
         fields = (
@@ -46,12 +47,16 @@ class OrganizationProfileSerializer(OrganizationSerializer):
             "address",
             "phone_number",
             "insta_link",
+            "avatar",
+            "avatar_variants",
             "following_count",
         )
 
 
 class OrganizationDetailSerializer(OrganizationSerializer):
     events = serializers.SerializerMethodField(read_only=True)
+    # The full list is served by OrganizationEventListView.
+    events_limit = 10
 
     class Meta:
         model = Organization
@@ -64,40 +69,17 @@ class OrganizationDetailSerializer(OrganizationSerializer):
             "address",
             "phone_number",
             "insta_link",
+            "avatar",
+            "avatar_variants",
             "events",
             "following_count",
         )
 
-    def map_event(self, event, request):
-        instance_types = {
-            "onetimeevent": (OneTimeEvent, OneTimeEventProfileSerializer),
-            "regularevent": (RegularEvent, RegularEventProfileSerializer),
-        }
-
-        for child_type in instance_types:
-            if not hasattr(event, child_type):
-                continue
-            model, serializer = instance_types[child_type]
-            obj = model.objects.filter(pk=event.pk)
-
-            if not obj:
-                return
-
-            data = serializer(obj.first()).data
-            data["event_type"] = child_type
-            return data
-        return
-
     def get_events(self, org) -> List[Dict]:
-        request = self.context.get("request")
-        elements = org.events.all()
-        events = []
-        for element in elements:
-            event = self.map_event(element, request)
-            if not event:
-                continue
-            events.append(event)
-        return events
+        events = org.events.annotate(event_type=annotate_event_type()).order_by("-id")
+        return PolymorphicEventProfileSerializer(
+            events[: self.events_limit], many=True, context=self.context
+        ).data
 
 
 class OrganizationCreatedSerializer(serializers.ModelSerializer):
@@ -6,6 +6,7 @@ from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from events.models import Category
 from events.serializers import CategorySerializer
 from users.models import Customer
+from utils.images import ImageVariantsField
 
 
 class CustomUserSerializer(serializers.ModelSerializer):
@@ -20,6 +21,8 @@ class CustomUserSerializer(serializers.ModelSerializer):
 class CustomerSerializer(serializers.ModelSerializer):
     id = serializers.SerializerMethodField()
     email = serializers.SerializerMethodField()
+    avatar = serializers.ImageField(read_only=True)
+    avatar_variants = ImageVariantsField("avatar")
     # interests = serializers.SerializerMethodField()
 
     class Meta:
@@ -30,6 +33,8 @@ class CustomerSerializer(serializers.ModelSerializer):
             "username",
             "first_name",
             "last_name",
+            "avatar",
+            "avatar_variants",
         )
 
     @staticmethod
@@ -55,6 +60,8 @@ class CustomerProfileSerializer(CustomerSerializer):
             "username",
             "first_name",
             "last_name",
+            "avatar",
+            "avatar_variants",
             "following_count",
         )
 
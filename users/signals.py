@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from users.models import Customer, FollowingOrganization, Organization
+from utils.cache import EVENTS, ORGANIZATIONS, invalidate
+from utils.images import reset_stale_variants
+
+
+@receiver([post_save, post_delete], sender=Organization)
+def invalidate_cached_organizations(sender, **kwargs):
+    # Event listings embed the organization name.
+    invalidate(ORGANIZATIONS, EVENTS)
+
+
+@receiver([post_save, post_delete], sender=FollowingOrganization)
+def invalidate_cached_following_counts(sender, **kwargs):
+    invalidate(ORGANIZATIONS)
+
+
+@receiver(pre_save, sender=Customer)
+@receiver(pre_save, sender=Organization)
+def reset_avatar_variants(sender, instance, raw=False, **kwargs):
+    if not raw:
+        reset_stale_variants(instance, "avatar")
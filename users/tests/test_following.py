@@ -0,0 +1,118 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from users.models import (
+    CustomUser,
+    Customer,
+    Following,
+    FollowingOrganization,
+)
+from utils.testing import create_organization
+
+
+class FollowingCountTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = create_organization()
+        cls.customers = []
+        for i in range(3):
+            user = CustomUser.objects.create(email=f"user{i}@test.com", password="foo")
+            cls.customers.append(
+                Customer.objects.create(user=user, username=f"user{i}")
+            )
+
+    def follow(self, customer, url_name, pk):
+        self.client.force_authenticate(customer.user)
+        return self.client.post(reverse(url_name, kwargs={"pk": pk}))
+
+    def test_follow_and_unfollow_update_counters(self):
+        first, second, third = self.customers
+        self.follow(first, "organization-follow", self.organization.pk)
+        self.follow(second, "organization-follow", self.organization.pk)
+        self.follow(first, "customer-follow", third.pk)
+        self.organization.refresh_from_db()
+        third.refresh_from_db()
+        self.assertEqual(self.organization.following_count, 2)
+        self.assertEqual(third.following_count, 1)
+
+        self.follow(first, "organization-follow", self.organization.pk)
+        self.organization.refresh_from_db()
+        self.assertEqual(self.organization.following_count, 1)
+
+    def test_missing_targets_and_duplicates(self):
+        customer = self.customers[0]
+        response = self.follow(customer, "organization-follow", 10**6)
+        self.assertEqual(response.status_code, 404)
+        response = self.follow(customer, "customer-follow", 10**6)
+        self.assertEqual(response.status_code, 404)
+
+        Following.objects.create(
+            follower=customer.user, following=self.customers[1].user
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Following.objects.create(
+                follower=customer.user, following=self.customers[1].user
+            )
+
+    def test_reconcile_repairs_drift(self):
+        first, second, third = self.customers
+        FollowingOrganization.objects.create(
+            follower=first.user, following=self.organization
+        )
+        Following.objects.create(follower=first.user, following=third.user)
+        Customer.objects.filter(pk=second.pk).update(following_count=5)
+
+        call_command("reconcile_following_counts", stdout=StringIO())
+        counts = dict(Customer.objects.values_list("username", "following_count"))
+        self.assertEqual(counts, {"user0": 0, "user1": 0, "user2": 1})
+        self.organization.refresh_from_db()
+        self.assertEqual(self.organization.following_count, 1)
+
+    def test_list_queries_do_not_grow_with_followers(self):
+        url = reverse("organization-list")
+        self.client.force_authenticate(self.customers[0].user)
+        with CaptureQueriesContext(connection) as empty:
+            self.client.get(url)
+        for customer in self.customers:
+            FollowingOrganization.objects.create(
+                follower=customer.user, following=self.organization
+            )
+        with CaptureQueriesContext(connection) as followed:
+            self.client.get(url)
+        self.assertEqual(len(followed), len(empty))
+
+    def test_state_lookup(self):
+        first, second, third = self.customers
+        FollowingOrganization.objects.create(
+            follower=first.user, following=self.organization
+        )
+        Following.objects.create(follower=first.user, following=third.user)
+        self.client.force_authenticate(first.user)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("following-state"),
+                {
+                    "organizations": [self.organization.pk, 10**6],
+                    "customers": [second.pk, third.pk],
+                },
+            )
+        self.assertEqual(
+            response.data,
+            {
+                "events": {},
+                "organizations": {
+                    str(self.organization.pk): True,
+                    str(10**6): False,
+                },
+                "customers": {str(second.pk): False, str(third.pk): True},
+            },
+        )
+
+        response = self.client.get(reverse("following-state"), {"events": "x"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from events.models import OccurrenceDays, OneTimeEvent, RegularEvent
+from users.serializers.organizations import OrganizationDetailSerializer
+from utils.testing import create_organization
+
+
+class OrganizationEventsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = create_organization()
+        cls.days = OccurrenceDays.objects.create(monday=True)
+        cls.detail_url = reverse(
+            "organization-profile", kwargs={"pk": cls.organization.pk}
+        )
+        cls.events_url = reverse(
+            "organization-events", kwargs={"pk": cls.organization.pk}
+        )
+
+    def create_events(self, count):
+        now = timezone.now()
+        for i in range(count):
+            fields = dict(
+                title=f"Event {i}",
+                description="",
+                organization=self.organization,
+                location="Bishkek",
+            )
+            if i % 2:
+                RegularEvent.objects.create(
+                    occurrence_days=self.days,
+                    start_time="10:00",
+                    end_time="11:00",
+                    **fields,
+                )
+            else:
+                OneTimeEvent.objects.create(
+                    start_time=now, end_time=now + timedelta(hours=1), **fields
+                )
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data, len(context)
+
+    def test_detail_embeds_capped_slice_in_constant_queries(self):
+        self.create_events(2)
+        _, few = self.get(self.detail_url)
+
+        self.create_events(30)
+        data, many = self.get(self.detail_url)
+        self.assertEqual(many, few)
+        self.assertEqual(len(data["events"]), OrganizationDetailSerializer.events_limit)
+        self.assertEqual(
+            {event["event_type"] for event in data["events"]}, {"onetime", "regular"}
+        )
+
+    def test_events_sub_resource_is_paginated(self):
+        self.create_events(5)
+        data, _ = self.get(self.events_url, limit=2, offset=2)
+        self.assertEqual(data["count"], 5)
+        self.assertEqual(len(data["results"]), 2)
+        self.assertIn("moderation_status", data["results"][0])
@@ -0,0 +1,114 @@
+import smtplib
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from users.mail import queue_email
+from users.models import CustomUser, OutgoingEmail
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    EMAIL_OUTBOX_MAX_ATTEMPTS=2,
+    EMAIL_OUTBOX_RETRY_DELAY=60,
+)
+class OutboxTests(APITestCase):
+    def send(self):
+        call_command("send_emails", stdout=StringIO())
+
+    def test_password_reset_is_queued(self):
+        CustomUser.objects.create(email="user@test.com", password="foo")
+        response = self.client.post(
+            reverse("password_reset"), {"email": "user@test.com"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mail.outbox, [])
+
+        self.send()
+        (message,) = mail.outbox
+        self.assertEqual(message.to, ["user@test.com"])
+        self.assertIn("password_reset/confirm", message.alternatives[0][0])
+        self.assertNotIn("<", message.body)
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.status, OutgoingEmail.SENT)
+
+        self.send()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_batches_share_a_connection(self):
+        for i in range(5):
+            queue_email("Subject", "Body", [f"user{i}@test.com"])
+        with mock.patch.object(
+            EmailBackend, "open", autospec=True, side_effect=EmailBackend.open
+        ) as opened:
+            call_command("send_emails", "--batch-size=2", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(opened.call_count, 1)
+
+    def test_idle_outbox_opens_no_connection(self):
+        email = queue_email("Subject", "Body", ["user@test.com"])
+        email.next_attempt_at = timezone.now() + timedelta(minutes=5)
+        email.save()
+        with mock.patch.object(EmailBackend, "open") as opened:
+            self.send()
+        opened.assert_not_called()
+
+    def test_failures_are_retried_with_backoff(self):
+        email = queue_email("Subject", "Body", ["user@test.com"])
+        failure = smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        with mock.patch.object(EmailBackend, "send_messages", side_effect=failure):
+            self.send()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutgoingEmail.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("SMTPServerDisconnected", email.last_error)
+        self.assertGreater(
+            email.next_attempt_at, timezone.now() + timedelta(seconds=50)
+        )
+
+        # Not due yet.
+        self.send()
+        self.assertEqual(mail.outbox, [])
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        with mock.patch.object(EmailBackend, "send_messages", side_effect=failure):
+            self.send()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutgoingEmail.FAILED)
+        self.assertEqual(email.attempts, 2)
+
+    def test_a_crash_resends_only_the_interrupted_email(self):
+        first, second = (
+            queue_email("Subject", "Body", [f"user{i}@test.com"]) for i in range(2)
+        )
+        crash = [None, KeyboardInterrupt()]
+        with mock.patch.object(
+            EmailBackend, "send_messages", autospec=True, side_effect=crash
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                self.send()
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, OutgoingEmail.SENT)
+        # Leased: other workers leave it alone until the lease runs out.
+        self.assertEqual(second.status, OutgoingEmail.PENDING)
+        self.assertEqual(second.attempts, 1)
+        self.assertGreater(second.next_attempt_at, timezone.now())
+
+        OutgoingEmail.objects.filter(pk=second.pk).update(
+            next_attempt_at=timezone.now()
+        )
+        self.send()
+        (message,) = mail.outbox
+        self.assertEqual(message.to, ["user1@test.com"])
+        second.refresh_from_db()
+        self.assertEqual(second.status, OutgoingEmail.SENT)
+        self.assertEqual(second.attempts, 2)
@@ -0,0 +1,61 @@
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from users.models import CustomUser, Customer, Organization
+from utils.db.queries import get_customers, get_organizations
+
+
+class PeopleSearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for name in ("Bishkek Philharmonic", "Philharmonia Club", "Chess club"):
+            user = CustomUser.objects.create(email=f"{name}@test.com", password="foo")
+            Organization.objects.create(
+                user=user, name=name, description="", type="Music"
+            )
+        for username in ("renee", "rene", "aibek"):
+            user = CustomUser.objects.create(
+                email=f"{username}@test.com", password="foo"
+            )
+            Customer.objects.create(user=user, username=username)
+
+    def search(self, url_name, keyword):
+        response = self.client.get(reverse(url_name), {"keyword": keyword})
+        return response.data["results"]
+
+    def test_organizations_tolerate_typos(self):
+        names = [org["name"] for org in self.search("organization-list", "philarmonia")]
+        self.assertEqual(names, ["Philharmonia Club", "Bishkek Philharmonic"])
+
+    def test_organizations_substring(self):
+        names = [org["name"] for org in self.search("organization-list", "club")]
+        self.assertEqual(sorted(names), ["Chess club", "Philharmonia Club"])
+
+    def test_customers_ranked_by_similarity(self):
+        usernames = [c["username"] for c in self.search("customer-list", "rene")]
+        self.assertEqual(usernames, ["rene", "renee"])
+
+    def test_search_is_served_by_the_trigram_indexes(self):
+        for queryset, indexes in (
+            (
+                get_organizations("club"),
+                ("organization_name_itrgm_idx", "organization_name_trgm_idx"),
+            ),
+            (
+                get_customers("rene"),
+                ("customer_username_itrgm_idx", "customer_username_trgm_idx"),
+            ),
+        ):
+            sql, params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                # Tiny tables are cheaper to scan whole, sequentially or along
+                # the primary key; only ask whether a search index fits.
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute("SET LOCAL enable_indexscan = off")
+                cursor.execute(f"EXPLAIN {sql}", params)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            # icontains is UPPER(column) LIKE: the plain column index cannot serve it.
+            self.assertNotIn("Seq Scan", plan, plan)
+            for index in indexes:
+                self.assertIn(index, plan, plan)
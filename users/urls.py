@@ -8,11 +8,16 @@ from users.views.customers import (
     CustomerTokenObtainPairView,
     CustomerProfileView, CustomerListView,
 )
-from users.views.following import FollowingOrganizationView, FollowingView
+from users.views.following import (
+    FollowingOrganizationView,
+    FollowingStateView,
+    FollowingView,
+)
 from users.views.organizations import (
     OrganizationSignUpView,
     OrganizationProfileView,
     OrganizationProfileDetailView, OrganizationListView,
+    OrganizationEventListView,
 )
 
 urlpatterns = [
@@ -53,6 +58,11 @@ urlpatterns = [
         OrganizationProfileDetailView.as_view(),
         name="organization-profile",
     ),
+    path(
+        "profile/organization/<int:pk>/events/",
+        OrganizationEventListView.as_view(),
+        name="organization-events",
+    ),
     path(
         "accounts/organizations/",
         OrganizationListView.as_view(),
@@ -73,4 +83,9 @@ urlpatterns = [
         FollowingView.as_view(),
         name="customer-follow",
     ),
+    path(
+        "accounts/following/state/",
+        FollowingStateView.as_view(),
+        name="following-state",
+    ),
 ]
@@ -1,7 +1,7 @@
 from django.contrib.auth.forms import SetPasswordForm
 from django.contrib.auth.tokens import default_token_generator
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
-from django.core.mail import send_mail, EmailMultiAlternatives
+from django.db import transaction
 from django.template.loader import render_to_string
 from django.utils.encoding import force_bytes
 from django.http import Http404
@@ -17,6 +17,7 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from config import settings
+from users.mail import queue_email
 from users.models import Customer
 from users.permissions import IsProfileOwnerOrReadOnly
 from users.serializers.passwords import (
@@ -32,6 +33,7 @@ from users.serializers.users import (
     CustomerProfileSerializer,
 )
 from utils.db.queries import get_customers
+from utils.db.routers import ReplicaReadMixin
 
 User = get_user_model()
 
@@ -72,19 +74,11 @@ class SendVerificationEmailView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        verification_token = self._generate_verification_token(user)
-        subject = "Verify your email address"
-        message = f"Here's your activation token: {verification_token}"
-        from_email = settings.DEFAULT_FROM_EMAIL
-        recipient_list = [email]
-
-        try:
-            send_mail(subject, message, from_email, recipient_list, fail_silently=False)
-        except:
-            return Response(
-                {"Details": "Could not send verification email."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        with transaction.atomic():
+            verification_token = self._generate_verification_token(user)
+            subject = "Verify your email address"
+            message = f"Here's your activation token: {verification_token}"
+            queue_email(subject, message, [email])
 
         return Response(
             {"Details": "Verification email sent."}, status=status.HTTP_400_BAD_REQUEST
@@ -120,7 +114,7 @@ class VerifyEmailView(APIView):
         return Response({"Details": "Email verified."})
 
 
-class CustomerProfileView(generics.RetrieveUpdateAPIView):
+class CustomerProfileView(ReplicaReadMixin, generics.RetrieveUpdateAPIView):
     serializer_class = CustomerProfileSerializer
     permission_classes = [IsProfileOwnerOrReadOnly]
 
@@ -146,7 +140,7 @@ class CustomerProfileView(generics.RetrieveUpdateAPIView):
         return Response(serializer.data)
 
 
-class CustomerListView(generics.ListAPIView):
+class CustomerListView(ReplicaReadMixin, generics.ListAPIView):
     serializer_class = CustomerProfileSerializer
 
     @extend_schema(
@@ -201,21 +195,14 @@ class PasswordResetView(generics.GenericAPIView):
                 "reset_url": reset_url,
             },
         )
-        plain_message = strip_tags(html_message)
-        from_email = settings.EMAIL_HOST_USER
-        recipient_list = [user.email]
-
-        email = EmailMultiAlternatives(
+        queue_email(
             subject,
-            plain_message,
-            from_email,
-            recipient_list,
+            strip_tags(html_message),
+            [user.email],
+            html_body=html_message,
+            from_email=settings.EMAIL_HOST_USER,
         )
 
-        email.content_subtype = "html"
-        email.attach_alternative(html_message, "text/html")
-        email.send()
-
         return Response(
             {"detail": "Password reset email has been sent."}, status=status.HTTP_200_OK
         )
@@ -3,9 +3,16 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
-from users.models import FollowingOrganization, Organization, Following
+from events import timeline
+from events.models import EventInterest
+from users.counters import adjust_following_count
+from users.models import Customer, FollowingOrganization, Organization, Following
+from users.serializers.following import StateQuerySerializer, StateSerializer
+from utils.cache import ORGANIZATIONS, invalidate
+from utils.db.queries import get_membership, toggle
 
 User = get_user_model()
 
@@ -23,29 +30,29 @@ class FollowingOrganizationView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        following = Organization.objects.filter(id=pk)
-        if not following:
+        with transaction.atomic():
+            delta = toggle(FollowingOrganization, follower=follower.pk, following=pk)
+            adjust_following_count(Organization, pk, delta)
+            if delta == 1:
+                timeline.backfill(follower.pk, pk)
+            elif delta == -1:
+                timeline.withdraw(follower.pk, pk)
+                timeline.resume_fan_out(pk)
+        if delta is None:
             return Response(
                 {
                     "Detail": "The organization with the given following_id does not exist."
                 },
                 status=status.HTTP_404_NOT_FOUND,
             )
+        # Raw statements bypass the model signals.
+        invalidate(ORGANIZATIONS)
 
-        if FollowingOrganization.objects.filter(
-            follower=follower, following=following.first()
-        ).exists():
-            FollowingOrganization.objects.filter(
-                follower=follower, following=following.first()
-            ).delete()
+        if delta < 0:
             return Response(
                 {"Detail": "You have unfollowed this organization."},
                 status=status.HTTP_200_OK,
             )
-
-        FollowingOrganization.objects.create(
-            follower=follower, following=following.first()
-        )
         return Response(
             {"Detail": "You are now following this organization."},
             status=status.HTTP_201_CREATED,
@@ -71,25 +78,57 @@ class FollowingView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        following = User.objects.filter(id=pk)
-        if not following:
+        with transaction.atomic():
+            delta = toggle(Following, follower=follower.pk, following=pk)
+            adjust_following_count(Customer, pk, delta)
+        if delta is None:
             return Response(
                 {"Detail": "The user with the given pk does not exist."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        if Following.objects.filter(
-            follower=follower, following=following.first()
-        ).exists():
-            Following.objects.filter(
-                follower=follower, following=following.first()
-            ).delete()
+        if delta < 0:
             return Response(
                 {"Detail": "You have unfollowed this user."}, status=status.HTTP_200_OK
             )
-
-        Following.objects.create(follower=follower, following=following.first())
         return Response(
             {"Detail": "You are now following this user."},
             status=status.HTTP_201_CREATED,
         )
+
+
+class FollowingStateView(APIView):
+    """Starred events and followed profiles among the given ids."""
+
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        responses=StateSerializer,
+        parameters=[
+            OpenApiParameter(name=name, type=int, many=True)
+            for name in StateQuerySerializer().fields
+        ],
+    )
+    def get(self, request):
+        self.check_permissions(request)
+        query = StateQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        ids = query.validated_data
+        user = request.user
+
+        state = {
+            "events": get_membership(
+                EventInterest.objects.filter(user=user), "event_id", ids["events"]
+            ),
+            "organizations": get_membership(
+                FollowingOrganization.objects.filter(follower=user),
+                "following_id",
+                ids["organizations"],
+            ),
+            "customers": get_membership(
+                Following.objects.filter(follower=user),
+                "following_id",
+                ids["customers"],
+            ),
+        }
+        return Response(StateSerializer(state).data, status=status.HTTP_200_OK)
@@ -1,10 +1,20 @@
 from django.contrib.auth import get_user_model
-from drf_spectacular.utils import extend_schema, OpenApiParameter
+from drf_spectacular.utils import (
+    extend_schema,
+    OpenApiParameter,
+    PolymorphicProxySerializer,
+)
 from rest_framework import status, generics
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from events.models import Event
+from events.serializers import (
+    OneTimeEventProfileSerializer,
+    PolymorphicEventProfileSerializer,
+    RegularEventProfileSerializer,
+)
 from users.models import Organization
 from users.permissions import (
     IsOrganizationOwnerOrReadOnly,
@@ -15,9 +25,14 @@ from users.serializers.organizations import (
     OrganizationSignUpSerializer,
     OrganizationCreatedSerializer,
     OrganizationSerializer,
-    OrganizationProfileSerializer, OrganizationDetailSerializer,
+    OrganizationProfileSerializer,
+    OrganizationDetailSerializer,
 )
-from utils.db.queries import get_organizations
+from utils.cache import ORGANIZATIONS, cache_response
+from utils.db.queries import annotate_event_type, get_organizations
+from utils.db.routers import ReplicaReadMixin
+from utils.pagination import CappedLimitOffsetPagination
+from utils.views import AsyncAPIView
 
 User = get_user_model()
 
@@ -53,26 +68,57 @@ class OrganizationProfileView(generics.ListAPIView):
         return Organization.objects.filter(user=self.kwargs.get("pk"))
 
 
-class OrganizationListView(generics.ListAPIView):
+class OrganizationListView(ReplicaReadMixin, AsyncAPIView):
     serializer_class = OrganizationProfileSerializer
+    pagination_class = CappedLimitOffsetPagination
 
     @extend_schema(
         responses=serializer_class(many=True),
         parameters=[
-            OpenApiParameter(name="keyword", type=str)
-        ]
+            OpenApiParameter(name="keyword", type=str),
+            OpenApiParameter(name="limit", type=int),
+            OpenApiParameter(name="offset", type=int),
+        ],
     )
-    def get(self, request):
-        return super().get(request)
+    @cache_response(ORGANIZATIONS)
+    async def get(self, request):
+        organizations = get_organizations(keyword=request.query_params.get("keyword"))
+        paginator = self.pagination_class()
+        result_page = await paginator.apaginate_queryset(organizations, request)
+        data = await self.serialize(result_page, many=True)
+        return paginator.get_paginated_response(data)
 
-    def get_queryset(self):
-        return get_organizations(
-            keyword=self.request.query_params.get("keyword")
-        )
 
-
-class OrganizationProfileDetailView(generics.RetrieveUpdateDestroyAPIView):
+class OrganizationProfileDetailView(
+    ReplicaReadMixin, generics.RetrieveUpdateDestroyAPIView
+):
     permission_classes = (IsOrganizationOwnerOrReadOnly,)
     serializer_class = OrganizationDetailSerializer
     lookup_url_kwarg = "pk"
     queryset = Organization.objects.all()
+
+
+class OrganizationEventListView(ReplicaReadMixin, generics.ListAPIView):
+    serializer_class = PolymorphicEventProfileSerializer
+
+    @extend_schema(
+        responses=PolymorphicProxySerializer(
+            component_name="OrganizationEvent",
+            serializers=[
+                OneTimeEventProfileSerializer,
+                RegularEventProfileSerializer,
+            ],
+            resource_type_field_name=None,
+            many=True,
+        )
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        return (
+            Event.objects.filter(organization_id=self.kwargs["pk"])
+            .annotate(event_type=annotate_event_type())
+            .defer("search_vector")
+            .order_by("-id")
+        )
@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+EVENTS = "events"
+CATEGORIES = "categories"
+ORGANIZATIONS = "organizations"
+
+
+def namespace_key(namespace):
+    return f"api:ns:{namespace}"
+
+
+def namespace_versions(namespaces):
+    """
+    Current version of each namespace. Versions start from a timestamp so a
+    namespace evicted from the cache never comes back at an old version.
+    """
+    keys = [namespace_key(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*namespaces):
+    """Orphan every cached response of the namespaces."""
+    bump(namespaces)
+    # A concurrent reader may cache the old rows again before the write commits.
+    transaction.on_commit(lambda: bump(namespaces))
+
+
+def bump(namespaces):
+    for namespace in namespaces:
+        key = namespace_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+
+def response_key(request, namespaces):
+    params = sorted((name, values) for name, values in request.query_params.lists())
+    digest = hashlib.md5(repr((request.get_host(), params)).encode()).hexdigest()
+    versions = ".".join(str(version) for version in namespace_versions(namespaces))
+    return f"api:{request.path}:{versions}:{digest}"
+
+
+def cache_response(*namespaces, timeout=None):
+    """
+    Cache successful anonymous GET responses of an API view method.
+
+    The key is built from the path and the normalized query parameters, and
+    embeds the versions of ``namespaces``, so ``invalidate`` drops every
+    response depending on a namespace at once. Coroutine methods get a
+    wrapper that does not block the event loop on the cache.
+    """
+
+    def decorator(method):
+        if asyncio.iscoroutinefunction(method):
+            return async_decorator(method)
+
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.user.is_authenticated:
+                return method(view, request, *args, **kwargs)
+
+            key = response_key(request, namespaces)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data, status=status.HTTP_200_OK)
+
+            response = method(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(
+                    key,
+                    response.data,
+                    settings.API_CACHE_TIMEOUT if timeout is None else timeout,
+                )
+            return response
+
+        return wrapper
+
+    def async_decorator(method):
+        @wraps(method)
+        async def wrapper(view, request, *args, **kwargs):
+            if request.user.is_authenticated:
+                return await method(view, request, *args, **kwargs)
+
+            key = await sync_to_async(response_key)(request, namespaces)
+            data = await cache.aget(key)
+            if data is not None:
+                return Response(data, status=status.HTTP_200_OK)
+
+            response = await method(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                await cache.aset(
+                    key,
+                    response.data,
+                    settings.API_CACHE_TIMEOUT if timeout is None else timeout,
+                )
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# The placeholders of an ``IN`` list count as one, whatever their number.
+PLACEHOLDER_RUN = re.compile(r"%s(?:\s*,\s*%s)+")
+
+
+def query_shape(sql):
+    """``sql`` as run before interpolation, with placeholder runs folded."""
+    return PLACEHOLDER_RUN.sub("%s", sql)
+
+
+class RepeatedQueryMiddleware:
+    """
+    Development aid logging the statements a request runs again and again
+    with only their parameters changing, the mark of an N+1 pattern.
+
+    Each shape run at least ``REPEATED_QUERY_THRESHOLD`` times during the
+    request is logged as a warning. Installed only when ``DEBUG`` is set.
+
+    Connections are per thread and ``execute_wrapper`` only sees the
+    connections of the thread installing it. Under ASGI the queries of a
+    request run on the thread its ``ThreadSensitiveContext`` hands to
+    ``sync_to_async(thread_sensitive=True)``, so the async path installs
+    the wrappers there rather than on the event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Mark the instance so Django awaits it.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        shapes = Counter()
+        with ExitStack() as stack:
+            self.install(stack, shapes)
+            response = self.get_response(request)
+        self.report(request, shapes)
+        return response
+
+    async def __acall__(self, request):
+        shapes = Counter()
+        stack = ExitStack()
+        await sync_to_async(self.install, thread_sensitive=True)(stack, shapes)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close, thread_sensitive=True)()
+        self.report(request, shapes)
+        return response
+
+    def install(self, stack, shapes):
+        def record(execute, sql, params, many, context):
+            shapes[query_shape(sql)] += 1
+            return execute(sql, params, many, context)
+
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(record))
+
+    def report(self, request, shapes):
+        for shape, count in shapes.most_common():
+            if count < settings.REPEATED_QUERY_THRESHOLD:
+                break
+            logger.warning(
+                "%s %s ran the same query %d times: %s",
+                request.method,
+                request.path,
+                count,
+                shape,
+            )
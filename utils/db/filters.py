@@ -0,0 +1,193 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from rest_framework.serializers import ValidationError
+
+from events.models import EventCategory, EventOccurrence, OneTimeEvent, RegularEvent
+from events.occurrences import local_midnight, local_timezone
+from events.search import event_search_query, event_search_rank
+
+
+class EventFilter:
+    """
+    Composable filter for event listings.
+
+    Each filter only adds a condition to the queryset, so the whole listing is
+    compiled by the ORM into a single parameterized statement and stays lazy
+    until the paginator slices it.
+
+    Calendar shortcuts ("today", "weekend", "week") and day filters are
+    resolved in ``settings.EVENTS_TIME_ZONE`` and compiled into half-open
+    ``start_time`` ranges, so they are served by the start time index.
+    One-time events are matched on their own columns; any other event type is
+    matched through its materialized ``EventOccurrence`` rows.
+    """
+
+    shortcuts = ("today", "weekend", "week")
+
+    event_types = {
+        "onetime": OneTimeEvent,
+        "regular": RegularEvent,
+    }
+
+    def __init__(self, model=OneTimeEvent, now=None):
+        self.model = model
+        self.now = now or timezone.now()
+        self.tz = local_timezone()
+        self.conditions = []
+        self.annotations = {}
+        self.rank = None
+
+    def from_query_params(self, query_params):
+        return (
+            self.keyword(query_params.get("keyword"))
+            .category(query_params.get("category"))
+            .start_date(query_params.get("start_time"))
+            .period(query_params.get("from"), query_params.get("to"))
+            .when(query_params.get("when"))
+            .upcoming(query_params.get("upcoming"))
+        )
+
+    def keyword(self, keyword: str = None):
+        if keyword:
+            query = event_search_query(keyword)
+            self.conditions.append(Q(search_vector=query))
+            self.rank = event_search_rank(query)
+        return self
+
+    def category(self, category: int = None):
+        if category:
+            self.conditions.append(
+                Exists(
+                    EventCategory.objects.filter(
+                        event=OuterRef("pk"),
+                        category_id=self._to_int(category, "category"),
+                    )
+                )
+            )
+        return self
+
+    def categories(self, category_ids):
+        """Events in any of the categories, found through the category index."""
+        self.conditions.append(
+            Q(
+                pk__in=EventCategory.objects.filter(
+                    category_id__in=category_ids
+                ).values("event_id")
+            )
+        )
+        return self
+
+    def where(self, *conditions):
+        self.conditions.extend(conditions)
+        return self
+
+    def moderated(self):
+        self.conditions.append(Q(moderation_status="модерация пройдена"))
+        return self
+
+    def start_date(self, start_time: int = None):
+        """Events starting on the local day that contains ``start_time``."""
+        if start_time:
+            moment = self._to_datetime(start_time, "start_time")
+            day = moment.astimezone(self.tz).date()
+            self._starting_between(day, day + timedelta(days=1))
+        return self
+
+    def period(self, start: int = None, end: int = None):
+        lookups = {}
+        if start:
+            lookups["start_time__gte"] = self._to_datetime(start, "from")
+        if end:
+            lookups["start_time__lt"] = self._to_datetime(end, "to")
+        if lookups:
+            self._add_time_condition(**lookups)
+        return self
+
+    def when(self, shortcut: str = None):
+        if not shortcut:
+            return self
+        if shortcut not in self.shortcuts:
+            raise ValidationError(
+                {"Detail": f"when must be one of: {', '.join(self.shortcuts)}"}
+            )
+
+        today = self.now.astimezone(self.tz).date()
+        next_monday = today + timedelta(days=7 - today.weekday())
+        if shortcut == "today":
+            self._starting_between(today, today + timedelta(days=1))
+        elif shortcut == "weekend":
+            saturday = next_monday - timedelta(days=2)
+            self._starting_between(max(today, saturday), next_monday)
+        else:
+            self._starting_between(today, next_monday)
+        return self
+
+    def upcoming(self, upcoming: bool = None):
+        """Events that have not finished yet."""
+        if upcoming in (True, "true", "1"):
+            self._add_time_condition(end_time__gte=self.now)
+        return self
+
+    def event_type(self, event_type: str = None):
+        if event_type:
+            if event_type not in self.event_types:
+                raise ValidationError(
+                    {"Detail": f"{event_type} is not an existing event type"}
+                )
+            child = self.event_types[event_type]._meta.model_name
+            self.conditions.append(Q(**{f"{child}__isnull": False}))
+        return self
+
+    def annotate(self, **annotations):
+        """Computed columns that ``ordering`` may refer to."""
+        self.annotations.update(annotations)
+        return self
+
+    def queryset(self, ordering=None):
+        """
+        Build the listing queryset.
+
+        Keyword searches are ordered by relevance first, ``ordering`` only
+        breaks ties between equally ranked events.
+        """
+        queryset = self.model.objects.filter(*self.conditions).defer("search_vector")
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+        ordering = tuple(ordering or ())
+        if self.rank is not None:
+            queryset = queryset.annotate(rank=self.rank)
+            ordering = ("-rank", *ordering)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    def _starting_between(self, first_day, last_day):
+        """Events starting from local midnight of ``first_day`` until ``last_day``."""
+        self._add_time_condition(
+            start_time__gte=local_midnight(first_day),
+            start_time__lt=local_midnight(last_day),
+        )
+
+    def _add_time_condition(self, **lookups):
+        if self.model is OneTimeEvent:
+            self.conditions.append(Q(**lookups))
+        else:
+            self.conditions.append(
+                Exists(EventOccurrence.objects.filter(event=OuterRef("pk"), **lookups))
+            )
+
+    @classmethod
+    def _to_datetime(cls, value, name):
+        try:
+            return datetime.fromtimestamp(cls._to_int(value, name), tz=dt_timezone.utc)
+        except (OverflowError, OSError):
+            raise ValidationError({"Detail": f"{name} is not a valid timestamp"})
+
+    @staticmethod
+    def _to_int(value, name):
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            raise ValidationError({"Detail": f"{name} must be an integer"})
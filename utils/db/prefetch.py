@@ -0,0 +1,56 @@
+from django.db.models import Prefetch
+
+
+class EagerLoadingMixin:
+    """
+    Serializer mixin declaring the related rows the serializer reads.
+
+    ``select_related_fields`` are joined into the main query. Each entry of
+    ``prefetch_related_fields`` is either a lookup or a ``(lookup, serializer)``
+    pair, in which case the prefetch queryset gets the nested serializer's own
+    plan, so plans compose through nested serializers. ``get_annotations``
+    adds computed columns (e.g. aggregated counts) to the main query.
+    """
+
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        annotations = cls.get_annotations()
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        prefetches = cls.get_prefetches()
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
+
+    @classmethod
+    def get_annotations(cls):
+        return {}
+
+    @classmethod
+    def get_prefetches(cls):
+        prefetches = []
+        for lookup in cls.prefetch_related_fields:
+            if isinstance(lookup, tuple):
+                lookup, serializer = lookup
+                queryset = serializer.setup_eager_loading(
+                    serializer.Meta.model.objects.all()
+                )
+                lookup = Prefetch(lookup, queryset=queryset)
+            prefetches.append(lookup)
+        return prefetches
+
+
+class EagerLoadingViewMixin:
+    """Apply the serializer's eager loading plan to the view's queryset."""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, "setup_eager_loading"):
+            queryset = serializer_class.setup_eager_loading(queryset)
+        return queryset
@@ -1,72 +1,264 @@
+from django.contrib.postgres.search import TrigramSimilarity
 from django.db import connection
-from events.models import OneTimeEvent, Category
-from django.db.models import Model
-from datetime import datetime
-
-from events.models import Event
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    Exists,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.utils import timezone
+from rest_framework.serializers import ValidationError
+from events.models import Category, Event, EventCategory, EventOccurrence
+from events.timeline import timeline_condition
 from users.models import Organization, Customer
+from utils.db.filters import EventFilter
 
+FEED_ANNOTATIONS = ("event_type", "next_occurrence")
+# Query parameters of EventFilter.from_query_params selecting a time range.
+DATE_FILTERS = ("start_time", "from", "to", "when", "upcoming")
+FEED_ORDERINGS = {
+    "next_occurrence": (F("next_occurrence").asc(nulls_last=True), "id"),
+    "recent": ("-id",),
+}
 
-def get_events(category, keyword, start_time: int = None, type: Event = OneTimeEvent):
-    cursor = connection.cursor()
 
-    cursor.execute(f"SELECT event_ptr_id FROM {type.objects.model._meta.db_table}")
-    objects_ids = {objects[0] for objects in cursor.fetchall()}
+def get_event_feed(query_params, now=None):
+    """
+    Events of every type in one lazy queryset over the base ``Event`` table,
+    tagged with ``event_type`` and the start of their ``next_occurrence``.
 
-    search_query = f"AND title ILIKE '%{keyword}%'" if keyword else ""
+    Without a date filter or keyword, the ``next_occurrence`` ordering only
+    lists events that have not finished, found through the occurrence end
+    time index: finished events have no next occurrence to sort by, and
+    computing it for the whole table would grow with the table's history.
+    """
+    now = now or timezone.now()
+    ordering = query_params.get("ordering") or "next_occurrence"
+    if ordering not in FEED_ORDERINGS:
+        raise ValidationError(
+            {"Detail": f"ordering must be one of: {', '.join(FEED_ORDERINGS)}"}
+        )
 
-    if category:
-        cursor.execute(
-            f"SELECT event_id FROM events_eventcategory WHERE category_id = {category}"
+    events = EventFilter(Event, now=now)
+    if ordering == "next_occurrence" and not any(
+        query_params.get(name) for name in ("keyword", *DATE_FILTERS)
+    ):
+        events.upcoming(True)
+    return (
+        events.from_query_params(query_params)
+        .event_type(query_params.get("event_type"))
+        .annotate(
+            event_type=annotate_event_type(),
+            next_occurrence=annotate_next_occurrence(now),
         )
-        objects_ids.intersection_update({objects[0] for objects in cursor.fetchall()})
+        .queryset(ordering=FEED_ORDERINGS[ordering])
+    )
 
-    if start_time:
-        cursor.execute(
-            f"SELECT event_ptr_id FROM events_onetimeevent WHERE DATE(start_time) = '{datetime.fromtimestamp(int(start_time)).date()}'::date"
+
+def get_personal_feed(customer, now=None):
+    """
+    Upcoming moderated events in the customer's ``interests_ids`` categories,
+    ranked by the number of interests they match, then by their next
+    occurrence, in a single statement.
+    """
+    now = now or timezone.now()
+    interests = customer.interests_ids or []
+    matches = (
+        EventCategory.objects.filter(event=OuterRef("pk"), category_id__in=interests)
+        .order_by()
+        .values("event")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return (
+        EventFilter(Event, now=now)
+        .moderated()
+        .categories(interests)
+        .upcoming(True)
+        .annotate(
+            event_type=annotate_event_type(),
+            next_occurrence=annotate_next_occurrence(now),
+            matches=Subquery(matches),
         )
-        objects_ids.intersection_update({objects[0] for objects in cursor.fetchall()})
+        .queryset(
+            ordering=("-matches", F("next_occurrence").asc(nulls_last=True), "id")
+        )
+    )
 
-    if not objects_ids:
-        return type.objects.none()
 
-    filter_ids_query = f"WHERE id = ANY(ARRAY{list(objects_ids)})"
+def get_timeline(user, now=None):
+    """
+    Upcoming moderated events of the organizations ``user`` follows, most
+    recently published first, read from the user's materialized inbox.
+    """
+    now = now or timezone.now()
+    return (
+        EventFilter(Event, now=now)
+        .moderated()
+        .upcoming(True)
+        .where(timeline_condition(user.pk))
+        .annotate(
+            event_type=annotate_event_type(),
+            next_occurrence=annotate_next_occurrence(now),
+        )
+        .queryset(ordering=("-id",))
+    )
 
-    cursor.execute(f"SELECT id FROM events_event {filter_ids_query} {search_query}")
-    events_ids = [objects[0] for objects in cursor.fetchall()]
-    return type.objects.filter(id__in=events_ids).order_by("-start_time")
 
+def annotate_next_occurrence(now):
+    return Subquery(
+        EventOccurrence.objects.filter(event=OuterRef("pk"), end_time__gte=now)
+        .order_by("start_time")
+        .values("start_time")[:1]
+    )
 
-def get_categories(is_not_empty: bool = False):
-    cursor = connection.cursor()
-    search_query = (
-        f"WHERE EXISTS (SELECT 1 FROM events_eventcategory WHERE events_eventcategory.category_id = events_category.id)"
-        if is_not_empty
-        else ""
+
+def annotate_event_type():
+    return Case(
+        *(
+            When(**{f"{model._meta.model_name}__isnull": False}, then=Value(name))
+            for name, model in EventFilter.event_types.items()
+        ),
+        output_field=CharField(),
     )
 
-    cursor.execute(f"SELECT id FROM events_category {search_query}")
-    categories_ids = [objects[0] for objects in cursor.fetchall()]
-    return Category.objects.filter(id__in=categories_ids)
 
+def load_event_children(events, plans=None):
+    """
+    Replace base ``Event`` rows by their child instances, keeping the order.
 
-def get_organizations(keyword):
-    cursor = connection.cursor()
+    Runs one query per event type (plus the prefetches of its ``plans``
+    entry) instead of resolving each row's child table separately. Events
+    must carry the ``event_type`` annotation; ``FEED_ANNOTATIONS`` are copied
+    over to the children.
+    """
+    events = list(events)
+    plans = plans or {}
+    ids_by_type = {}
+    for event in events:
+        ids_by_type.setdefault(event.event_type, []).append(event.pk)
+
+    children = {}
+    for event_type, ids in ids_by_type.items():
+        model = EventFilter.event_types.get(event_type)
+        if model is None:
+            continue
+        queryset = model.objects.filter(pk__in=ids).defer("search_vector")
+        if event_type in plans:
+            queryset = plans[event_type](queryset)
+        children.update((child.pk, child) for child in queryset)
+
+    result = []
+    for event in events:
+        child = children.get(event.pk)
+        if child is None:
+            continue
+        for name in FEED_ANNOTATIONS:
+            if hasattr(event, name):
+                setattr(child, name, getattr(event, name))
+        result.append(child)
+    return result
 
-    search_query = f"WHERE name ILIKE '%{keyword}%'" if keyword else ""
 
-    cursor.execute(f"SELECT id FROM {Organization.objects.model._meta.db_table} {search_query}")
-    objects_ids = {objects[0] for objects in cursor.fetchall()}
+def get_categories(is_not_empty: bool = False):
+    """Lazy, so it can be evaluated through the sync or the async ORM."""
+    categories = Category.objects.order_by("id")
+    if is_not_empty:
+        categories = categories.filter(
+            Exists(EventCategory.objects.filter(category=OuterRef("pk")))
+        )
+    return categories
 
-    return Organization.objects.filter(id__in=objects_ids)
+
+def get_organizations(keyword):
+    return search_by_similarity(Organization.objects.all(), "name", keyword)
 
 
 def get_customers(keyword):
-    cursor = connection.cursor()
+    return search_by_similarity(
+        Customer.objects.select_related("user"), "username", keyword
+    )
 
-    search_query = f"WHERE username ILIKE '%{keyword}%'" if keyword else ""
 
-    cursor.execute(f"SELECT user_id FROM {Customer.objects.model._meta.db_table} {search_query}")
-    objects_ids = {objects[0] for objects in cursor.fetchall()}
+def search_by_similarity(queryset, field, keyword):
+    """
+    Typo-tolerant search served by a ``gin_trgm_ops`` index on ``field``.
+
+    Rows containing ``keyword`` or trigram-similar to it are returned in one
+    query, the closest matches first.
+    """
+    if not keyword:
+        return queryset.order_by("pk")
+
+    return (
+        queryset.annotate(similarity=TrigramSimilarity(field, keyword))
+        .filter(
+            Q(**{f"{field}__icontains": keyword})
+            | Q(**{f"{field}__trigram_similar": keyword})
+        )
+        .order_by("-similarity", "pk")
+    )
+
+
+def toggle(model, **fields):
+    """
+    Delete the ``model`` row matching ``fields`` (values by field name) or
+    insert it when there is none, in at most two statements. A unique
+    constraint over the fields keeps it correct under concurrent toggles.
+
+    Returns -1 when a row was deleted, 1 when one was inserted, 0 when a
+    concurrent request inserted it first and None when a row referenced by a
+    foreign key does not exist. Foreign keys are checked in the statement
+    itself because the constraints are deferred to the end of the transaction.
+    """
+    quote = connection.ops.quote_name
+    opts = model._meta
+    columns, targets = [], []
+    for name, value in fields.items():
+        field = opts.get_field(name)
+        columns.append(quote(field.column))
+        if field.is_relation:
+            related = field.related_model._meta
+            targets.append(
+                (
+                    f"EXISTS (SELECT 1 FROM {quote(related.db_table)} "
+                    f"WHERE {quote(related.pk.column)} = %s)",
+                    value,
+                )
+            )
+    values = list(fields.values())
+    table = quote(opts.db_table)
+
+    with connection.cursor() as cursor:
+        condition = " AND ".join(f"{column} = %s" for column in columns)
+        cursor.execute(f"DELETE FROM {table} WHERE {condition} RETURNING 1", values)
+        if cursor.fetchone():
+            return -1
+
+        selected = ", ".join(f"%s AS {column}" for column in columns)
+        exists = " AND ".join(check for check, _ in targets) or "TRUE"
+        cursor.execute(
+            f"WITH new AS (SELECT {selected} WHERE {exists}), "
+            f"inserted AS (INSERT INTO {table} ({', '.join(columns)}) "
+            "SELECT * FROM new ON CONFLICT DO NOTHING RETURNING 1) "
+            "SELECT (SELECT COUNT(*) FROM new), (SELECT COUNT(*) FROM inserted)",
+            values + [value for _, value in targets],
+        )
+        new, inserted = cursor.fetchone()
+        if not new:
+            return None
+        return 1 if inserted else 0
+
 
-    return Customer.objects.filter(user_id__in=objects_ids)
+def get_membership(queryset, field, ids):
+    """Map each of ``ids`` to whether ``queryset`` has a row with ``field`` set to it."""
+    if not ids:
+        return {}
+    found = set(queryset.filter(**{f"{field}__in": ids}).values_list(field, flat=True))
+    return {pk: pk in found for pk in ids}
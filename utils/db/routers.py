@@ -0,0 +1,82 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.permissions import SAFE_METHODS
+
+# Set for the duration of a safe request to a ``ReplicaReadMixin`` view.
+replica_reads = ContextVar("replica_reads", default=False)
+
+
+class ReplicaRouter:
+    """
+    Send reads to a random ``REPLICA_DATABASES`` alias while the current
+    request allows it, and everything else to ``default``.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            replica_reads.get()
+            and settings.REPLICA_DATABASES
+            # Reads inside a transaction must see its own writes.
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return random.choice(settings.REPLICA_DATABASES)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def pin_key(user_id):
+    return f"db:pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """Read from ``default`` for the user until the replicas caught up."""
+    cache.set(pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    return user.is_authenticated and cache.get(pin_key(user.pk)) is not None
+
+
+class ReplicaReadMixin:
+    """
+    API view mixin serving safe requests from the replicas, unless the user
+    wrote something in the last ``REPLICA_PIN_SECONDS``.
+
+    Authentication runs before the switch, so it always reads the primary.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_pinned_to_primary(request.user):
+            replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # The context outlives the request under WSGI: never leak the switch.
+        replica_reads.set(False)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaPinMiddleware(MiddlewareMixin):
+    """Pin the author of every successful unsafe request to the primary."""
+
+    def process_response(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            # DRF copies the user it authenticated onto the Django request.
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user.pk)
+        return response
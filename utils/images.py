@@ -0,0 +1,152 @@
+import os
+import time
+import uuid
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+from PIL import Image, ImageOps, UnidentifiedImageError
+from rest_framework import serializers
+
+from utils.cache import invalidate
+
+# Longest side of each variant, in pixels.
+VARIANTS = {
+    "thumbnail": 320,
+    "medium": 1024,
+}
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+# Seconds after which rows claimed by a worker that never finished them are
+# handed out again.
+CLAIM_TIMEOUT = 10 * 60
+
+
+def generate_variants(field_file):
+    """
+    Store resized WebP and JPEG copies of an uploaded image next to it.
+
+    The copies are re-encoded from the pixels only, so EXIF (including GPS
+    position) and other metadata are dropped; the orientation tag is applied
+    first. Returns the description saved in the model's variants field.
+    """
+    try:
+        with field_file.open("rb") as source:
+            image = Image.open(source)
+            image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as error:
+        return {"error": str(error)}
+
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    stem, _ = os.path.splitext(field_file.name)
+    variants = {"width": image.width, "height": image.height}
+    for variant, size in VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.LANCZOS)
+        variants[variant] = {"width": resized.width, "height": resized.height}
+        for extension, (image_format, options) in FORMATS.items():
+            encoded = resized if image_format != "JPEG" else resized.convert("RGB")
+            buffer = BytesIO()
+            encoded.save(buffer, image_format, **options)
+            variants[variant][extension] = field_file.storage.save(
+                f"{stem}_{variant}.{extension}", ContentFile(buffer.getvalue())
+            )
+    return variants
+
+
+def process_pending(model, field, batch_size=50, namespaces=()):
+    """
+    Generate the variants of every ``model`` row whose ``field`` has none yet.
+
+    Each batch is claimed in a short transaction: rows are locked with
+    ``SKIP LOCKED``, so several workers can share the backlog, and marked as
+    in progress. The images are then processed outside of any transaction
+    and each row's variants are written back on their own, unless the image
+    was replaced meanwhile. A row that fails records the error instead, so
+    it leaves the backlog without holding up the others. The cache
+    ``namespaces`` are invalidated after every batch. Returns the number of
+    processed rows.
+    """
+    variants_field = f"{field}_variants"
+    processed = 0
+    while True:
+        now = int(time.time())
+        claim = {"processing": now, "claim": uuid.uuid4().hex}
+        pending = (
+            model.objects.filter(
+                Q(**{variants_field: {}})
+                | Q(**{f"{variants_field}__processing__lt": now - CLAIM_TIMEOUT})
+            )
+            .exclude(**{f"{field}__isnull": True})
+            .exclude(**{field: ""})
+            .order_by("pk")
+        )
+        with transaction.atomic():
+            batch = list(pending.select_for_update(skip_locked=True)[:batch_size])
+            model.objects.filter(pk__in=[instance.pk for instance in batch]).update(
+                **{variants_field: claim}
+            )
+        if not batch:
+            return processed
+
+        for instance in batch:
+            try:
+                variants = generate_variants(getattr(instance, field))
+            except Exception as error:
+                variants = {"error": f"{type(error).__name__}: {error}"}
+            model.objects.filter(
+                pk=instance.pk, **{f"{variants_field}__claim": claim["claim"]}
+            ).update(**{variants_field: variants})
+        # Updates skip the signals that keep cached responses fresh.
+        if namespaces:
+            invalidate(*namespaces)
+        processed += len(batch)
+
+
+def reset_stale_variants(instance, field):
+    """Forget the variants of a replaced or removed image (pre_save)."""
+    field_file = getattr(instance, field)
+    if not field_file or not field_file._committed:
+        setattr(instance, f"{field}_variants", {})
+
+
+@extend_schema_field(OpenApiTypes.OBJECT)
+class ImageVariantsField(serializers.Field):
+    """
+    Dimensions and URLs of the generated variants of an image field, or
+    ``None`` while they are still being processed.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        kwargs.update(source="*", read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        field_file = getattr(instance, self.image_field)
+        variants = getattr(instance, f"{self.image_field}_variants")
+        # Rows being processed or that failed have no dimensions.
+        if not field_file or "width" not in variants:
+            return None
+
+        storage = field_file.storage
+        representation = {"width": variants["width"], "height": variants["height"]}
+        for variant in VARIANTS:
+            described = variants[variant]
+            representation[variant] = {
+                "width": described["width"],
+                "height": described["height"],
+                **{
+                    extension: storage.url(described[extension])
+                    for extension in FORMATS
+                },
+            }
+        return representation
@@ -0,0 +1,63 @@
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+
+from events.models import OneTimeEvent
+from users.models import CustomUser, Organization
+
+MODERATED = "модерация пройдена"
+
+
+def create_organization(name="Test Organization", email="org@test.com", user=None):
+    """An organization, with a new account of ``email`` unless ``user`` is given."""
+    if user is None:
+        user = CustomUser.objects.create(email=email, password="foo")
+    return Organization.objects.create(
+        user=user, name=name, description="", type="Charity"
+    )
+
+
+def create_event(
+    organization, title="Event", start=None, duration=timedelta(hours=2), **fields
+):
+    """A one-time event of ``organization`` starting at ``start`` (now by default)."""
+    start = start or timezone.now()
+    return OneTimeEvent.objects.create(
+        title=title,
+        description="",
+        organization=organization,
+        location="Bishkek",
+        start_time=start,
+        end_time=start + duration,
+        **fields,
+    )
+
+
+class TemporaryMediaMixin:
+    """
+    Store the files of a test case in a temporary ``MEDIA_ROOT`` on the local
+    file system, removed after the class; ``media_settings`` are overridden
+    along with it.
+    """
+
+    media_settings = {}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_override = override_settings(
+            MEDIA_ROOT=cls.media_root,
+            DEFAULT_FILE_STORAGE="django.core.files.storage.FileSystemStorage",
+            **cls.media_settings,
+        )
+        cls.media_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media_override.disable()
+        shutil.rmtree(cls.media_root)
+        super().tearDownClass()
@@ -0,0 +1,92 @@
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+UPLOAD_CONTENT_TYPES = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+}
+
+
+def get_upload_backend():
+    return import_string(settings.UPLOADS_BACKEND)()
+
+
+def upload_key(prefix, content_type):
+    return f"uploads/{prefix}/{uuid.uuid4().hex}{UPLOAD_CONTENT_TYPES[content_type]}"
+
+
+class S3UploadBackend:
+    """
+    Presigned POST straight to the bucket of ``S3Boto3Storage``; the size
+    limit is part of the signed policy, so S3 rejects larger bodies itself.
+    """
+
+    def __init__(self):
+        self.storage = default_storage
+        self.client = self.storage.connection.meta.client
+
+    def issue(self, key, content_type, request=None):
+        post = self.client.generate_presigned_post(
+            Bucket=self.storage.bucket_name,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, settings.UPLOAD_MAX_SIZE],
+            ],
+            ExpiresIn=settings.UPLOAD_URL_EXPIRES,
+        )
+        return {"method": "POST", "url": post["url"], "form_fields": post["fields"]}
+
+    def size(self, key):
+        """Size of the uploaded object, or ``None`` if it was never uploaded."""
+        from botocore.exceptions import ClientError
+
+        try:
+            head = self.client.head_object(Bucket=self.storage.bucket_name, Key=key)
+        except ClientError:
+            return None
+        return head["ContentLength"]
+
+
+class LocalUploadBackend:
+    """
+    Filesystem stand-in for S3: the upload URL points at ``LocalUploadView``,
+    which checks the signed token and writes the body to the default storage.
+    """
+
+    salt = "utils.uploads"
+
+    def __init__(self):
+        self.storage = default_storage
+
+    def issue(self, key, content_type, request=None):
+        token = signing.dumps(
+            {"key": key, "content_type": content_type}, salt=self.salt
+        )
+        url = reverse("local-upload", kwargs={"token": token})
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        return {"method": "PUT", "url": url, "form_fields": {}}
+
+    def load(self, token):
+        """The upload a token was issued for; raises ``signing.BadSignature``."""
+        return signing.loads(token, salt=self.salt, max_age=settings.UPLOAD_URL_EXPIRES)
+
+    def save(self, key, content):
+        # Re-uploading to the same URL replaces the file, as on S3.
+        if self.storage.exists(key):
+            self.storage.delete(key)
+        self.storage.save(key, ContentFile(content))
+
+    def size(self, key):
+        if not self.storage.exists(key):
+            return None
+        return self.storage.size(key)
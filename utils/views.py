@@ -0,0 +1,50 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    ``APIView`` whose handlers are coroutines.
+
+    Under ASGI the request is served on the event loop, so waiting on the
+    database or on a slow client does not hold a worker thread. The
+    synchronous parts of DRF (authentication, permission and throttle
+    checks, which may query the database) run through ``sync_to_async``.
+    Handlers fetch rows with the async ORM and serialize them with
+    ``serialize``.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def serialize(self, instance, serializer_class=None, **kwargs):
+        """
+        Serialized data of ``instance``. Serializers may still read related
+        rows lazily, so they run in a thread rather than on the event loop.
+        """
+        serializer_class = serializer_class or self.serializer_class
+        kwargs.setdefault("context", {"request": self.request, "view": self})
+        return await sync_to_async(lambda: serializer_class(instance, **kwargs).data)()